@@ -0,0 +1,214 @@
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from PIL import Image, ImageTk
+
+from ..utils.constants import (
+    ASSETS_INFO,
+    ASSET_CACHE_DIR,
+    COLOR_A,
+    COLOR_B,
+    RESOURCES_DIR,
+    WINDOW_HEIGHT,
+    WINDOW_WIDTH,
+)
+from ..utils.theme import Theme
+
+# decoded themes kept in memory; switching between the two themes never reloads them
+MAX_CACHED_THEMES: int = 2
+# the images the main menu needs, loaded before the window is shown; the others are preloaded
+MENU_ASSET_NAMES: tuple[str, ...] = ("menu_image", "menu_button")
+STONE_SIZE: tuple[int, int] = (int(WINDOW_WIDTH * 0.07), int(WINDOW_HEIGHT * 0.07))
+
+
+def get_theme_subdirectory(theme: Theme) -> str:
+    if theme == Theme.DEFAULT:
+        return "default"
+    else:
+        return "alternative"
+
+
+def get_asset_specifications() -> list[tuple[str, str, tuple[int, int]]]:
+    # (asset name, file name, size on screen) of every image of a theme
+    specifications = []
+    for file_name, size in ASSETS_INFO:
+        specifications.append((file_name.removesuffix(".png"), file_name, size))
+    for color in (COLOR_A, COLOR_B):
+        for j in range(6):
+            specifications.append((color + str(j), color + str(j) + ".png", STONE_SIZE))
+    return specifications
+
+
+class AssetCacheStatistics:
+    def __init__(self) -> None:
+        self.memory_hits: int = 0
+        self.disk_hits: int = 0
+        self.resizes: int = 0
+        self.evictions: int = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"themes from memory={self.memory_hits} images from disk cache={self.disk_hits} "
+            f"images resized={self.resizes} themes evicted={self.evictions}"
+        )
+
+
+class ResizedImageCache:
+    # resized images kept on disk as raw pixels, named after the source file, its modification time and
+    # the target size, so editing a PNG or changing ASSETS_INFO only misses the images affected
+    def __init__(
+        self,
+        resources_dir: Path = RESOURCES_DIR,
+        cache_dir: Path | None = ASSET_CACHE_DIR,
+        statistics: AssetCacheStatistics | None = None,
+    ) -> None:
+        self.resources_dir: Path = resources_dir
+        self.cache_dir: Path | None = cache_dir
+        if statistics is None:
+            statistics = AssetCacheStatistics()
+        self.statistics: AssetCacheStatistics = statistics
+
+    def get_cache_prefix(self, subdirectory: str, file_name: str, size: tuple[int, int]) -> str:
+        return f"{subdirectory}-{file_name.removesuffix('.png')}-{size[0]}x{size[1]}-"
+
+    def get_cache_path(self, subdirectory: str, file_name: str, size: tuple[int, int], mtime_ns: int, mode: str) -> Path:
+        return self.cache_dir / f"{self.get_cache_prefix(subdirectory, file_name, size)}{mtime_ns}.{mode}"
+
+    def load_image(self, subdirectory: str, file_name: str, size: tuple[int, int]) -> Image.Image:
+        source_path = self.resources_dir / subdirectory / file_name
+        if self.cache_dir is None:
+            return self.resize_image(source_path, size)
+        mtime_ns = source_path.stat().st_mtime_ns
+        for mode in ("RGBA", "RGB"):
+            cache_path = self.get_cache_path(subdirectory, file_name, size, mtime_ns, mode)
+            try:
+                data = cache_path.read_bytes()
+            except OSError:
+                continue
+            if len(data) == size[0] * size[1] * len(mode):
+                self.statistics.disk_hits += 1
+                return Image.frombytes(mode, size, data)
+        image = self.resize_image(source_path, size)
+        self.store_image(subdirectory, file_name, size, mtime_ns, image)
+        return image
+
+    def resize_image(self, source_path: Path, size: tuple[int, int]) -> Image.Image:
+        self.statistics.resizes += 1
+        image = Image.open(source_path)
+        if image.mode not in ("RGBA", "RGB"):
+            image = image.convert("RGBA")
+        return image.resize(size)
+
+    def store_image(self, subdirectory: str, file_name: str, size: tuple[int, int], mtime_ns: int, image: Image.Image) -> None:
+        # the cache is only an optimization: a read-only or full disk just means resizing again next time
+        cache_path = self.get_cache_path(subdirectory, file_name, size, mtime_ns, image.mode)
+        temporary_path = cache_path.with_name(cache_path.name + f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            for stale_path in self.cache_dir.glob(self.get_cache_prefix(subdirectory, file_name, size) + "*"):
+                stale_path.unlink(missing_ok=True)
+            temporary_path.write_bytes(image.tobytes())
+            os.replace(temporary_path, cache_path)
+        except OSError:
+            temporary_path.unlink(missing_ok=True)
+
+
+class AssetCache:
+    # PhotoImages of the themes used so far, up to max_themes, the least recently used theme evicted first;
+    # a theme may be partially loaded, the rest of its images being added when asked for or preloaded
+    def __init__(
+        self,
+        max_themes: int = MAX_CACHED_THEMES,
+        resources_dir: Path = RESOURCES_DIR,
+        cache_dir: Path | None = ASSET_CACHE_DIR,
+    ) -> None:
+        self.max_themes: int = max(1, max_themes)
+        self.statistics: AssetCacheStatistics = AssetCacheStatistics()
+        self.resized_images: ResizedImageCache = ResizedImageCache(resources_dir, cache_dir, self.statistics)
+        self.themes: OrderedDict[Theme, dict[str, ImageTk.PhotoImage]] = OrderedDict()
+
+    def get_statistics(self) -> AssetCacheStatistics:
+        return self.statistics
+
+    def get_resized_images(self) -> ResizedImageCache:
+        return self.resized_images
+
+    def get_missing_assets(self, theme: Theme, names: tuple[str, ...] | None = None) -> list[tuple[str, str, tuple[int, int]]]:
+        assets = self.themes.get(theme, {})
+        return [
+            specification for specification in get_asset_specifications()
+            if specification[0] not in assets and (names is None or specification[0] in names)
+        ]
+
+    def get_assets(self, theme: Theme, names: tuple[str, ...] | None = None) -> dict[str, ImageTk.PhotoImage]:
+        # the theme's dictionary, with at least the given images (all of them by default) loaded; the same
+        # dictionary is filled in place later on, so the interfaces holding it see the images added
+        assets = self.themes.get(theme)
+        if assets is None:
+            assets = {}
+            self.themes[theme] = assets
+            while len(self.themes) > self.max_themes:
+                # widgets still showing an evicted image keep their own reference to it
+                self.themes.popitem(last=False)
+                self.statistics.evictions += 1
+        else:
+            self.themes.move_to_end(theme)
+        missing_assets = self.get_missing_assets(theme, names)
+        if not missing_assets:
+            self.statistics.memory_hits += 1
+        subdirectory = get_theme_subdirectory(theme)
+        for name, file_name, size in missing_assets:
+            assets[name] = ImageTk.PhotoImage(self.resized_images.load_image(subdirectory, file_name, size))
+        return assets
+
+    def has_room_for(self, theme: Theme) -> bool:
+        return theme in self.themes or len(self.themes) < self.max_themes
+
+    def add_images(self, theme: Theme, images: dict[str, Image.Image]) -> None:
+        # images decoded elsewhere; a theme not cached yet becomes the first one to be evicted, so
+        # preloading never pushes out the theme on screen
+        if theme not in self.themes:
+            if not self.has_room_for(theme):
+                return
+            self.themes[theme] = {}
+            self.themes.move_to_end(theme, last=False)
+        assets = self.themes[theme]
+        for name, image in images.items():
+            if name not in assets:
+                assets[name] = ImageTk.PhotoImage(image)
+
+
+class AssetPreloader:
+    # decodes and resizes images in a worker thread; only the PhotoImages, which belong to Tk, are created
+    # by the Tk loop, in the callback posted through post (EventPump.post)
+    def __init__(self, asset_cache: AssetCache, post: Callable) -> None:
+        self.asset_cache: AssetCache = asset_cache
+        self.post: Callable = post
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="assets")
+
+    def preload(self, theme: Theme, on_done: Callable | None = None) -> None:
+        # called from the Tk loop; on_done() runs in it once the theme is complete
+        missing_assets = self.asset_cache.get_missing_assets(theme)
+        if not self.asset_cache.has_room_for(theme):
+            missing_assets = []
+        self.executor.submit(self.decode, theme, missing_assets, on_done)
+
+    def decode(self, theme: Theme, missing_assets: list[tuple[str, str, tuple[int, int]]], on_done: Callable | None) -> None:
+        subdirectory = get_theme_subdirectory(theme)
+        resized_images = self.asset_cache.get_resized_images()
+        images = {}
+        for name, file_name, size in missing_assets:
+            images[name] = resized_images.load_image(subdirectory, file_name, size)
+        self.post(self.deliver, theme, images, on_done)
+
+    def deliver(self, theme: Theme, images: dict[str, Image.Image], on_done: Callable | None) -> None:
+        self.asset_cache.add_images(theme, images)
+        if on_done is not None:
+            on_done()
+
+    def stop(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
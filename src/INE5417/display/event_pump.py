@@ -0,0 +1,119 @@
+import queue
+import time
+import tkinter as tk
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from ..dog.dog_interface import DogPlayerInterface
+from ..dog.start_status import StartStatus
+
+# the Tk loop looks for network events about once per frame
+PUMP_INTERVAL_MS: int = 16
+
+
+class EventPumpStatistics:
+    def __init__(self) -> None:
+        self.events: int = 0
+        self.batches: int = 0
+        self.max_queue_depth: int = 0
+        self.total_latency: float = 0.0
+        self.max_latency: float = 0.0
+
+    def record_batch(self, queue_depth: int) -> None:
+        self.batches += 1
+        self.max_queue_depth = max(self.max_queue_depth, queue_depth)
+
+    def record_render(self, latency: float) -> None:
+        # latency: from the network thread posting the event to Tk being idle again after redrawing
+        self.events += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    def get_mean_latency(self) -> float:
+        if self.events == 0:
+            return 0.0
+        return self.total_latency / self.events
+
+    def __repr__(self) -> str:
+        return (
+            f"events={self.events} batches={self.batches} max queue depth={self.max_queue_depth} "
+            f"event to render mean={self.get_mean_latency() * 1000:.1f} ms max={self.max_latency * 1000:.1f} ms"
+        )
+
+
+class EventPump:
+    # inbound queue of callbacks posted by the network threads and run by the Tk loop, the only thread
+    # that touches the widgets and the Board; outbound requests run one at a time in a worker thread
+    def __init__(self, root: tk.Tk, interval_ms: int = PUMP_INTERVAL_MS) -> None:
+        self.root: tk.Tk = root
+        self.interval_ms: int = interval_ms
+        self.events: queue.SimpleQueue = queue.SimpleQueue()
+        self.statistics: EventPumpStatistics = EventPumpStatistics()
+        self.outbound: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="outbound")
+        self.after_id: str | None = None
+
+    def get_statistics(self) -> EventPumpStatistics:
+        return self.statistics
+
+    def get_queue_depth(self) -> int:
+        return self.events.qsize()
+
+    def post(self, callback: Callable, *args) -> None:
+        # the only method that may be called from other threads
+        self.events.put((time.perf_counter(), callback, args))
+
+    def submit(self, function: Callable, on_done: Callable | None, *args) -> None:
+        # runs function(*args) away from the Tk loop, then on_done(result) in it
+        future = self.outbound.submit(function, *args)
+        if on_done is not None:
+            future.add_done_callback(lambda done: self.post(self.deliver, done, on_done))
+
+    def deliver(self, future: Future, on_done: Callable) -> None:
+        on_done(future.result())
+
+    def start(self) -> None:
+        self.after_id = self.root.after(self.interval_ms, self.drain)
+
+    def stop(self) -> None:
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+        self.outbound.shutdown(wait=False)
+
+    def drain(self) -> None:
+        try:
+            queue_depth = self.events.qsize()
+            if queue_depth > 0:
+                self.statistics.record_batch(queue_depth)
+                posted_times = []
+                # events posted while draining wait for the next frame
+                for _ in range(queue_depth):
+                    posted_time, callback, args = self.events.get_nowait()
+                    posted_times.append(posted_time)
+                    callback(*args)
+                # the widgets changed by the whole batch are redrawn once, by the idle tasks queued before this one
+                self.root.after_idle(self.record_render, posted_times)
+        finally:
+            self.after_id = self.root.after(self.interval_ms, self.drain)
+
+    def record_render(self, posted_times: list[float]) -> None:
+        now = time.perf_counter()
+        for posted_time in posted_times:
+            self.statistics.record_render(now - posted_time)
+
+
+class QueuedPlayerActor(DogPlayerInterface):
+    # given to the DOG actors in place of the player interface: their callbacks are queued for the Tk loop
+    def __init__(self, player_interface: DogPlayerInterface, event_pump: EventPump) -> None:
+        super().__init__()
+        self.player_interface: DogPlayerInterface = player_interface
+        self.event_pump: EventPump = event_pump
+
+    def receive_start(self, start_status: StartStatus) -> None:
+        self.event_pump.post(self.player_interface.receive_start, start_status)
+
+    def receive_move(self, a_move: int) -> None:
+        self.event_pump.post(self.player_interface.receive_move, a_move)
+
+    def receive_withdrawal_notification(self) -> None:
+        self.event_pump.post(self.player_interface.receive_withdrawal_notification)
@@ -0,0 +1,103 @@
+import tkinter as tk
+from collections.abc import Callable
+
+from .asset_cache import STONE_SIZE
+from .renderer import Renderer
+from ..utils.constants import NUMBER_OF_STONE_VALUES
+
+# each player holds two stones of each value, drawn in two columns (slots), the left one first
+SLOTS: int = 2
+SLOT_PADDING: int = 4
+SLOT_WIDTH: int = STONE_SIZE[0] + 2 * SLOT_PADDING
+SLOT_HEIGHT: int = STONE_SIZE[1] + 2 * SLOT_PADDING
+LABEL_HEIGHT: int = 24
+PANEL_BORDER: int = 2
+SELECTED_COLOR: str = "yellow"
+
+
+def get_slot(in_left: bool) -> int:
+    return 0 if in_left else 1
+
+
+class HandPanel:
+    # the stones in a player's hand, drawn on a single canvas: one background rectangle and one image per
+    # (stone value, slot), found through items, and clicks mapped to a stone by their coordinates
+    def __init__(
+        self,
+        parent: tk.Widget,
+        color: str,
+        assets: dict[str, tk.PhotoImage],
+        text: str,
+        renderer: Renderer,
+        on_select: Callable[[int, bool], None] | None = None,
+    ) -> None:
+        self.color: str = color
+        self.renderer: Renderer = renderer
+        self.on_select: Callable[[int, bool], None] | None = on_select
+        self.canvas: tk.Canvas = tk.Canvas(
+            parent,
+            width=SLOTS * SLOT_WIDTH,
+            height=LABEL_HEIGHT + NUMBER_OF_STONE_VALUES * SLOT_HEIGHT,
+            relief=tk.SOLID,
+            borderwidth=PANEL_BORDER,
+            highlightthickness=0,
+        )
+        self.canvas.create_text(PANEL_BORDER + SLOTS * SLOT_WIDTH // 2, PANEL_BORDER + LABEL_HEIGHT // 2, text=text)
+        # (stone value, slot) -> (background rectangle id, image id)
+        self.items: dict[tuple[int, int], tuple[int, int]] = {}
+        self.in_hand: dict[tuple[int, int], bool] = {}
+        for stone_value in range(NUMBER_OF_STONE_VALUES):
+            for slot in range(SLOTS):
+                x = PANEL_BORDER + slot * SLOT_WIDTH
+                y = PANEL_BORDER + LABEL_HEIGHT + stone_value * SLOT_HEIGHT
+                background = self.canvas.create_rectangle(x, y, x + SLOT_WIDTH, y + SLOT_HEIGHT, fill="", outline="")
+                image = self.canvas.create_image(
+                    x + SLOT_WIDTH // 2, y + SLOT_HEIGHT // 2, image=assets[f"{color}{stone_value}"]
+                )
+                self.items[(stone_value, slot)] = (background, image)
+                self.in_hand[(stone_value, slot)] = True
+        if on_select is not None:
+            self.canvas.bind("<Button-1>", self.clicked)
+
+    def get_canvas(self) -> tk.Canvas:
+        return self.canvas
+
+    def get_color(self) -> str:
+        return self.color
+
+    def is_in_hand(self, stone_value: int, in_left: bool) -> bool:
+        return self.in_hand[(stone_value, get_slot(in_left))]
+
+    def hit_test(self, x: int, y: int) -> tuple[int, bool] | None:
+        # the (stone value, in left) drawn at the canvas coordinates, if that stone is in the hand
+        column = (x - PANEL_BORDER) // SLOT_WIDTH
+        row = (y - PANEL_BORDER - LABEL_HEIGHT) // SLOT_HEIGHT
+        if not (0 <= column < SLOTS and 0 <= row < NUMBER_OF_STONE_VALUES) or y < PANEL_BORDER + LABEL_HEIGHT:
+            return None
+        if not self.in_hand[(row, column)]:
+            return None
+        return row, column == 0
+
+    def clicked(self, event: tk.Event) -> None:
+        hit = self.hit_test(event.x, event.y)
+        if hit is not None:
+            self.on_select(*hit)
+
+    def take_stone(self, stone_value: int, in_left: bool) -> None:
+        key = (stone_value, get_slot(in_left))
+        self.in_hand[key] = False
+        self.renderer.itemconfig(self.canvas, self.items[key][1], state=tk.HIDDEN)
+        self.renderer.itemconfig(self.canvas, self.items[key][0], fill="")
+
+    def return_stone(self, stone_value: int, in_left: bool) -> None:
+        key = (stone_value, get_slot(in_left))
+        self.in_hand[key] = True
+        self.renderer.itemconfig(self.canvas, self.items[key][1], state=tk.NORMAL)
+
+    def set_selected(self, stone_value: int, in_left: bool, selected: bool) -> None:
+        background = self.items[(stone_value, get_slot(in_left))][0]
+        self.renderer.itemconfig(self.canvas, background, fill=SELECTED_COLOR if selected else "")
+
+    def update_images(self, assets: dict[str, tk.PhotoImage]) -> None:
+        for (stone_value, _), (_, image) in self.items.items():
+            self.renderer.itemconfig(self.canvas, image, image=assets[f"{self.color}{stone_value}"])
@@ -1,17 +1,19 @@
 import tkinter as tk
 from tkinter import ttk
 
+from .renderer import Renderer
 from ..utils.constants import WINDOW_WIDTH, WINDOW_HEIGHT
 
 
 class MainMenuInterface:
     def __init__(
-        self, root: tk.Tk, assets: dict[str, tk.PhotoImage], player_interface
+        self, root: tk.Tk, assets: dict[str, tk.PhotoImage], player_interface, renderer: Renderer
     ) -> None:
         self.menu_canvas: tk.Canvas | None = None
         self.root: tk.Tk = root
         self.assets: dict[str, tk.PhotoImage] = assets
         self.player_interface = player_interface
+        self.renderer: Renderer = renderer
         self.frame: ttk.Frame | None = None
 
     def get_frame(self) -> ttk.Frame:
@@ -50,5 +52,5 @@ class MainMenuInterface:
 
     def update_widgets_images(self, assets: dict[str, tk.PhotoImage]) -> None:
         self.set_assets(assets)
-        self.menu_canvas.itemconfig("menu_image", image=self.assets["menu_image"])
-        self.menu_canvas.itemconfig("menu_button", image=self.assets["menu_button"])
+        self.renderer.itemconfig(self.menu_canvas, "menu_image", image=self.assets["menu_image"])
+        self.renderer.itemconfig(self.menu_canvas, "menu_button", image=self.assets["menu_button"])
@@ -3,38 +3,69 @@ import tkinter as tk
 from tkinter import messagebox, simpledialog
 from tkinter import ttk
 
-from PIL import ImageTk, Image
+from PIL import ImageTk
 
+from .asset_cache import AssetCache, AssetPreloader, MENU_ASSET_NAMES
+from .event_pump import EventPump, QueuedPlayerActor
 from .game_interface import GameInterface
 from .main_menu_interface import MainMenuInterface
-from ..dog.dog_actor import DogActor
+from .renderer import Renderer
+from ..dog.dog_actor import DogActor, DEFAULT_TRANSPORT
 from ..dog.dog_interface import DogPlayerInterface
+from ..dog.dog_proxy import DOG_SERVER_URL
 from ..dog.start_status import StartStatus
+from ..engine.engine_actor import EngineActor
+from ..logic.game_record import GameRecordWriter
 from ..utils.constants import (
     GAME_NAME,
-    WINDOW_WIDTH,
-    WINDOW_HEIGHT,
     WINDOW_GEOMETRY,
-    RESOURCES_DIR,
     FONT,
-    COLOR_A,
-    COLOR_B, ASSETS_INFO,
 )
 from ..utils.game_state import GameState
+from ..utils.startup_timer import StartupTimer, STARTUP_BUDGET
 from ..utils.theme import Theme
 
 
 class PlayerInterface(DogPlayerInterface):
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        engine_time_budget: float | None = None,
+        dog_server_url: str = DOG_SERVER_URL,
+        dog_transport: str = DEFAULT_TRANSPORT,
+        game_record_path: str | None = None,
+        profile_startup: bool = False,
+        startup_timer: StartupTimer | None = None,
+    ) -> None:
         super().__init__()
+        if startup_timer is None:
+            startup_timer = StartupTimer()
+        self.startup_timer: StartupTimer = startup_timer
+        # with profile_startup, the startup phases are printed once they are done and the counters
+        # gathered while playing are printed on exit
+        self.profile_startup: bool = profile_startup
+        self.startup_reported: bool = False
         self.root: tk.Tk = tk.Tk()
         self.initialize_gui_elements()
+        self.startup_timer.mark("tk")
+        # network callbacks, the results of outbound requests and preloaded images reach the widgets only
+        # through the pump
+        self.event_pump: EventPump = EventPump(self.root)
+        self.renderer: Renderer = Renderer(self.root)
         self.theme: Theme = self.get_default_theme()
-        self.assets: dict[str, ImageTk.PhotoImage] = self.load_assets()
+        self.asset_cache: AssetCache = AssetCache()
+        self.asset_preloader: AssetPreloader = AssetPreloader(self.asset_cache, self.event_pump.post)
+        # the menu is shown as soon as its own images are loaded, the others are decoded in the background
+        self.assets: dict[str, ImageTk.PhotoImage] = self.asset_cache.get_assets(self.theme, MENU_ASSET_NAMES)
+        self.startup_timer.mark("imagens do menu")
         self.main_menu_interface: MainMenuInterface = MainMenuInterface(
-            self.root, self.assets, self
+            self.root, self.assets, self, self.renderer
         )
-        self.game_interface: GameInterface = GameInterface(self.root, self.assets, self)
+        self.game_interface: GameInterface = GameInterface(self.root, self.assets, self, self.renderer)
+        # every match, local and received moves, is appended to the game record file when one is given
+        self.game_recorder: GameRecordWriter | None = None
+        if game_record_path is not None:
+            self.game_recorder = GameRecordWriter(game_record_path)
+        self.game_interface.set_game_recorder(self.game_recorder)
 
         self.main_menu_interface.initialize_frame()
 
@@ -43,15 +74,73 @@ class PlayerInterface(DogPlayerInterface):
         main_menu_frame = self.main_menu_interface.get_frame()
         self.set_main_frame(main_menu_frame)
         self.main_frame.pack(fill=tk.BOTH, side=tk.TOP, anchor=tk.CENTER, expand=True)
+        self.startup_timer.mark("menu")
+
+        # started before the name dialog, whose event loop already runs the pump
+        self.event_pump.start()
+        self.startup_timer.begin("imagens da partida")
+        self.asset_preloader.preload(self.theme, self.receive_preloaded_assets)
 
         self.player_name: str = simpledialog.askstring(prompt="Nome do jogador", title="")
-        self.dog: DogActor = DogActor()
-        message = self.dog.initialize(self.player_name, self)
-        messagebox.showinfo(message=message)
+        self.startup_timer.mark("nome do jogador")
+        self.start_match_pending: bool = False
+        if engine_time_budget is None:
+            self.dog: DogActor | EngineActor = DogActor(dog_server_url, dog_transport)
+        else:
+            self.dog = EngineActor(engine_time_budget)
+        # the connection is made by the outbound worker, ahead of any request the menu may send
+        self.startup_timer.begin("rede")
+        self.event_pump.submit(
+            self.dog.initialize, self.receive_initialization_message,
+            self.player_name, QueuedPlayerActor(self, self.event_pump),
+        )
         self.game_interface.set_game_state(GameState.MAIN_MENU)
         self.update_gui()
         self.root.mainloop()
 
+    def receive_initialization_message(self, message: str) -> None:
+        self.startup_timer.end("rede")
+        self.report_startup()
+        messagebox.showinfo(message=message)
+
+    def receive_preloaded_assets(self) -> None:
+        self.startup_timer.end("imagens da partida")
+        alternative_theme = Theme.ALTERNATIVE if self.theme == Theme.DEFAULT else Theme.DEFAULT
+        self.startup_timer.begin("tema alternativo")
+        self.asset_preloader.preload(alternative_theme, self.receive_preloaded_alternative_theme)
+
+    def receive_preloaded_alternative_theme(self) -> None:
+        self.startup_timer.end("tema alternativo")
+        self.report_startup()
+
+    def report_startup(self) -> None:
+        # once, when the network and the background loading are both done; the preload may finish while the
+        # name dialog is open, before the network phase has begun
+        network_done = self.startup_timer.get_phase_duration("rede") is not None
+        if (
+            self.profile_startup and not self.startup_reported
+            and network_done and not self.startup_timer.has_open_phases()
+        ):
+            self.startup_reported = True
+            print(self.startup_timer.format_report())
+            print(f"  {self.asset_cache.get_statistics()}")
+            time_to_menu = self.startup_timer.get_time_until("menu")
+            if time_to_menu is not None and time_to_menu > STARTUP_BUDGET:
+                print(f"  menu exibido após {time_to_menu * 1000:.0f} ms, acima do limite de {STARTUP_BUDGET * 1000:.0f} ms")
+
+    def report_statistics(self) -> None:
+        print("Estatísticas:")
+        print(f"  eventos de rede: {self.event_pump.get_statistics()}")
+        print(f"  desenho: {self.renderer.get_statistics()}")
+        if isinstance(self.dog, DogActor):
+            print("  requisições ao DOG:")
+            for line in repr(self.dog.get_request_statistics()).splitlines():
+                print(f"    {line}")
+            print(f"  jogadas recebidas: {self.dog.get_polling_statistics()}")
+
+    def get_startup_timer(self) -> StartupTimer:
+        return self.startup_timer
+
     def initialize_gui_elements(self) -> None:
         style = ttk.Style(self.root)
         style.theme_use("clam")
@@ -92,28 +181,8 @@ class PlayerInterface(DogPlayerInterface):
     def get_default_theme(self) -> Theme:
         return Theme.DEFAULT
 
-    def load_assets(self) -> dict[str, tk.PhotoImage]:
-        if self.theme == Theme.DEFAULT:
-            assets_subdirectory = "default"
-        else:
-            assets_subdirectory = "alternative"
-        assets = {}
-
-        assets_bound = len(ASSETS_INFO)
-        for i in range(assets_bound):
-            image = Image.open(RESOURCES_DIR / assets_subdirectory / ASSETS_INFO[i][0])
-            resized_image = image.resize(ASSETS_INFO[i][1])
-            assets[ASSETS_INFO[i][0].removesuffix(".png")] = ImageTk.PhotoImage(resized_image)
-
-        colors = [COLOR_A, COLOR_B]
-        colors_bound = len(colors)
-        for i in range(colors_bound):
-            for j in range(6):
-                stone_image = Image.open(RESOURCES_DIR / assets_subdirectory / (colors[i]  + str(j) + ".png"))
-                resized_stone_image = stone_image.resize((int(WINDOW_WIDTH * 0.07), int(WINDOW_HEIGHT * 0.07)))
-                assets[colors[i] + str(j)] = ImageTk.PhotoImage(resized_stone_image)
-
-        return assets
+    def load_assets(self) -> dict[str, ImageTk.PhotoImage]:
+        return self.asset_cache.get_assets(self.theme)
 
     def set_main_frame(self, new_frame: ttk.Frame) -> None:
         self.main_frame = new_frame
@@ -144,6 +213,8 @@ class PlayerInterface(DogPlayerInterface):
 
     def perform_match_start(self, start_status: StartStatus, game_state: GameState) -> None:
         players = start_status.get_players()
+        # the images still being preloaded are loaded right away
+        self.asset_cache.get_assets(self.theme)
         self.game_interface.start_match(players)
         self.game_interface.initialize_frame()
         game_frame = self.game_interface.get_frame()
@@ -163,7 +234,7 @@ class PlayerInterface(DogPlayerInterface):
             self.perform_match_start(start_status, GameState.REMOTE_PLAYER_TO_MOVE)
             messagebox.showinfo(message="Partida iniciada!")
 
-    def receive_move(self, a_move: dict[str, str]) -> None:
+    def receive_move(self, a_move: int) -> None:
         game_state = self.game_interface.get_game_state()
         if game_state == GameState.REMOTE_PLAYER_TO_MOVE:
             self.game_interface.receive_move(a_move)
@@ -174,6 +245,7 @@ class PlayerInterface(DogPlayerInterface):
         game_state = self.game_interface.get_game_state()
         if game_state == GameState.LOCAL_PLAYER_TO_MOVE or GameState.REMOTE_PLAYER_TO_MOVE:
             self.game_interface.set_game_state(GameState.ABANDONED_BY_OTHER_PLAYER)
+            self.game_interface.end_game_record()
             self.update_gui()
 
     def is_main_screen_filled(self) -> bool:
@@ -186,15 +258,19 @@ class PlayerInterface(DogPlayerInterface):
         game_state = self.game_interface.get_game_state()
         if game_state == GameState.MAIN_MENU:
             answer = messagebox.askyesno("START", "Deseja iniciar uma nova partida?")
-            if answer:
-                start_status: StartStatus = self.dog.start_match(2)
-                message: str = start_status.get_message()
-                code: str = start_status.get_code()
-                if code == "0" or code == "1":
-                    messagebox.showinfo(message=message)
-                elif code == "2":
-                    self.perform_match_start(start_status, GameState.LOCAL_PLAYER_TO_MOVE)
-                    messagebox.showinfo(message=message)
+            if answer and not self.start_match_pending:
+                self.start_match_pending = True
+                self.event_pump.submit(self.dog.start_match, self.receive_start_match_result, 2)
+
+    def receive_start_match_result(self, start_status: StartStatus) -> None:
+        self.start_match_pending = False
+        message: str = start_status.get_message()
+        code: str = start_status.get_code()
+        if code == "0" or code == "1":
+            messagebox.showinfo(message=message)
+        elif code == "2" and self.game_interface.get_game_state() == GameState.MAIN_MENU:
+            self.perform_match_start(start_status, GameState.LOCAL_PLAYER_TO_MOVE)
+            messagebox.showinfo(message=message)
 
     def go_to_main_menu(self):
         game_state = self.game_interface.get_game_state()
@@ -202,19 +278,50 @@ class PlayerInterface(DogPlayerInterface):
             game_state == GameState.GAME_OVER
             or game_state == GameState.ABANDONED_BY_OTHER_PLAYER
         ):
-            main_menu_frame = self.main_menu_interface.get_frame()
-            is_main_screen_filled = self.is_main_screen_filled()
-            if is_main_screen_filled:
-                self.main_frame.pack_forget()
-            self.set_main_frame(main_menu_frame)
-            self.main_frame.pack(
-                fill=tk.BOTH, side=tk.TOP, anchor=tk.CENTER, expand=True
-            )
-            self.game_interface.set_game_state(GameState.MAIN_MENU)
-            self.update_gui()
+            self.show_main_menu()
 
-    def send_move(self, move: dict[str, str]) -> None:
-        self.dog.send_move(move)
+    def show_main_menu(self) -> None:
+        main_menu_frame = self.main_menu_interface.get_frame()
+        is_main_screen_filled = self.is_main_screen_filled()
+        if is_main_screen_filled:
+            self.main_frame.pack_forget()
+        self.set_main_frame(main_menu_frame)
+        self.main_frame.pack(
+            fill=tk.BOTH, side=tk.TOP, anchor=tk.CENTER, expand=True
+        )
+        self.game_interface.set_game_state(GameState.MAIN_MENU)
+        self.update_gui()
+
+    def send_move(self, move: int) -> None:
+        self.event_pump.submit(self.dog.send_move, lambda delivered: self.receive_move_delivery(move, delivered), move)
+
+    def receive_move_delivery(self, move: int, delivered: bool) -> None:
+        if not delivered:
+            retry = messagebox.askretrycancel(message="A jogada não foi entregue ao servidor. Tentar novamente?")
+            if retry:
+                self.send_move(move)
+            else:
+                # the other player never sees the move, so the match cannot go on
+                self.game_interface.end_game_record()
+                self.show_main_menu()
+
+    def get_engine_report(self) -> str:
+        # how far the computer searched for its last move, when playing against it
+        if not isinstance(self.dog, EngineActor):
+            return ""
+        search_result = self.dog.get_last_search_result()
+        if search_result is None:
+            return ""
+        return (
+            f" (computador: profundidade {search_result.get_depth()}, "
+            f"{search_result.get_nodes_per_second():,.0f} nós/s)"
+        )
+
+    def get_event_pump(self) -> EventPump:
+        return self.event_pump
+
+    def get_renderer(self) -> Renderer:
+        return self.renderer
 
     def update_gui(self) -> None:
         game_state = self.game_interface.get_game_state()
@@ -224,7 +331,7 @@ class PlayerInterface(DogPlayerInterface):
             case GameState.MAIN_MENU:
                 message += 'Inicie a partida apertando o "Play"'
             case GameState.LOCAL_PLAYER_TO_MOVE:
-                message += "Selecione uma pedra ou círculo"
+                message += "Selecione uma pedra ou círculo" + self.get_engine_report()
             case GameState.REMOTE_PLAYER_TO_MOVE:
                 message += "Espere o outro jogador jogar"
             case GameState.GAME_OVER:
@@ -236,27 +343,32 @@ class PlayerInterface(DogPlayerInterface):
                     message += "Jogador remoto venceu"
             case GameState.ABANDONED_BY_OTHER_PLAYER:
                 message += "Partida abandonada pelo outro jogador"
-        self.message_label.configure(text=message)
-        self.message_label.update()
+        self.renderer.configure(self.message_label, text=message)
 
         if (
             game_state == GameState.GAME_OVER
             or game_state == GameState.ABANDONED_BY_OTHER_PLAYER
         ):
-            self.menu.entryconfigure(1, state=tk.NORMAL)
+            self.renderer.entryconfigure(self.menu, 1, state=tk.NORMAL)
         else:
-            self.menu.entryconfigure(1, state=tk.DISABLED)
+            self.renderer.entryconfigure(self.menu, 1, state=tk.DISABLED)
 
         if game_state == GameState.MAIN_MENU:
-            self.menu.entryconfigure(2, state=tk.NORMAL)
-            self.menu.entryconfigure(4, state=tk.NORMAL)
+            self.renderer.entryconfigure(self.menu, 2, state=tk.NORMAL)
+            self.renderer.entryconfigure(self.menu, 4, state=tk.NORMAL)
         else:
-            self.menu.entryconfigure(2, state=tk.DISABLED)
-            self.menu.entryconfigure(4, state=tk.DISABLED)
-
-        self.menu.update()
+            self.renderer.entryconfigure(self.menu, 2, state=tk.DISABLED)
+            self.renderer.entryconfigure(self.menu, 4, state=tk.DISABLED)
 
     def exit_game(self) -> None:
         game_state = self.game_interface.get_game_state()
         if game_state == GameState.MAIN_MENU:
+            self.event_pump.stop()
+            self.renderer.cancel()
+            self.asset_preloader.stop()
+            self.dog.close()
+            if self.game_recorder is not None:
+                self.game_recorder.close()
+            if self.profile_startup:
+                self.report_statistics()
             sys.exit(0)
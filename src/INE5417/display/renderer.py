@@ -0,0 +1,92 @@
+import time
+import tkinter as tk
+
+
+class RenderStatistics:
+    def __init__(self) -> None:
+        self.frames: int = 0
+        self.requested_changes: int = 0
+        self.applied_changes: int = 0
+        self.total_frame_time: float = 0.0
+        self.max_frame_time: float = 0.0
+
+    def record_frame(self, applied_changes: int, frame_time: float) -> None:
+        self.frames += 1
+        self.applied_changes += applied_changes
+        self.total_frame_time += frame_time
+        self.max_frame_time = max(self.max_frame_time, frame_time)
+
+    def get_mean_frame_time(self) -> float:
+        if self.frames == 0:
+            return 0.0
+        return self.total_frame_time / self.frames
+
+    def __repr__(self) -> str:
+        return (
+            f"frames={self.frames} changes requested={self.requested_changes} applied={self.applied_changes} "
+            f"frame time mean={self.get_mean_frame_time() * 1000:.2f} ms max={self.max_frame_time * 1000:.2f} ms"
+        )
+
+
+class Renderer:
+    # the widget changes asked for while handling an event are kept in a dirty set, the last value of each
+    # option winning, and applied in a single pass once Tk is idle, just before it redraws
+    def __init__(self, root: tk.Tk) -> None:
+        self.root: tk.Tk = root
+        self.statistics: RenderStatistics = RenderStatistics()
+        self.widget_options: dict[tk.Misc, dict] = {}
+        self.item_options: dict[tuple[tk.Canvas, str | int], dict] = {}
+        self.entry_options: dict[tuple[tk.Menu, int], dict] = {}
+        self.after_id: str | None = None
+
+    def get_statistics(self) -> RenderStatistics:
+        return self.statistics
+
+    def configure(self, widget: tk.Misc, **options) -> None:
+        self.widget_options.setdefault(widget, {}).update(options)
+        self.schedule(len(options))
+
+    def itemconfig(self, canvas: tk.Canvas, tag_or_id: str | int, **options) -> None:
+        self.item_options.setdefault((canvas, tag_or_id), {}).update(options)
+        self.schedule(len(options))
+
+    def entryconfigure(self, menu: tk.Menu, index: int, **options) -> None:
+        self.entry_options.setdefault((menu, index), {}).update(options)
+        self.schedule(len(options))
+
+    def schedule(self, changes: int) -> None:
+        self.statistics.requested_changes += changes
+        if self.after_id is None:
+            self.after_id = self.root.after_idle(self.flush)
+
+    def flush(self) -> None:
+        self.after_id = None
+        start = time.perf_counter()
+        widget_options, self.widget_options = self.widget_options, {}
+        item_options, self.item_options = self.item_options, {}
+        entry_options, self.entry_options = self.entry_options, {}
+        applied_changes = 0
+        for widget, options in widget_options.items():
+            applied_changes += self.apply(widget.configure, options)
+        for (canvas, tag_or_id), options in item_options.items():
+            applied_changes += self.apply(canvas.itemconfigure, options, tag_or_id)
+        for (menu, index), options in entry_options.items():
+            applied_changes += self.apply(menu.entryconfigure, options, index)
+        # the redraws the changes above queued run before this idle callback, so the frame time covers them
+        self.root.after_idle(self.record_frame, applied_changes, start)
+
+    def apply(self, method, options: dict, *args) -> int:
+        # a widget destroyed after the change was asked for is skipped
+        try:
+            method(*args, **options)
+        except tk.TclError:
+            return 0
+        return max(1, len(options))
+
+    def record_frame(self, applied_changes: int, start: float) -> None:
+        self.statistics.record_frame(applied_changes, time.perf_counter() - start)
+
+    def cancel(self) -> None:
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
@@ -0,0 +1,84 @@
+import asyncio
+from .async_dog_proxy import AsyncDogProxy
+from .polling_thread import PollingSchedule
+
+
+class AsyncDogActor:
+    # DogActor for an asyncio event loop: every call is a coroutine, the polling runs as a task of
+    # the same loop instead of a thread, so one process can keep many sessions open at once
+    def __init__(self, executor=None, **proxy_options):
+        super().__init__()
+        self.proxy = AsyncDogProxy(executor, **proxy_options)
+        self.player_actor = None
+        self.schedule = PollingSchedule(self.proxy)
+        self.wake_event = None
+        self.polling_task = None
+
+    async def initialize(self, player_name, a_player_actor):
+        self.player_actor = a_player_actor
+        message = await self.proxy.initialize(player_name, self)
+        self.wake_event = asyncio.Event()
+        self.polling_task = asyncio.get_running_loop().create_task(self.poll_forever())
+        return message
+
+    async def start_match(self, number_of_players):
+        start_status = await self.proxy.start_match(number_of_players)
+        self.wake()
+        return start_status
+
+    async def send_move(self, move):
+        # whether the move reached the server
+        if await self.proxy.send_move(move) is None:
+            return False
+        self.wake()
+        return True
+
+    def wake(self):
+        self.schedule.wake()
+        if self.wake_event is not None:
+            self.wake_event.set()
+
+    async def poll_forever(self):
+        while True:
+            self.wake_event.clear()
+            await self.poll()
+            try:
+                await asyncio.wait_for(self.wake_event.wait(), self.schedule.next_interval())
+            except asyncio.TimeoutError:
+                pass
+
+    async def poll(self):
+        status = self.proxy.get_status()
+        if status == 2:  #   connected without match
+            self.schedule.get_statistics().record_request("started/")
+            if await self.proxy.start_status():
+                self.wake()
+        elif status == 3:  #   waiting remote move
+            local_turn, now = self.schedule.before_match_poll()
+            received = await self.proxy.match_status()
+            self.schedule.after_match_poll(local_turn, now, received)
+
+    def get_proxy(self):
+        return self.proxy
+
+    def get_polling_statistics(self):
+        return self.schedule.get_statistics()
+
+    async def close(self):
+        if self.polling_task is not None:
+            self.polling_task.cancel()
+            try:
+                await self.polling_task
+            except asyncio.CancelledError:
+                pass
+            self.polling_task = None
+        self.proxy.close()
+
+    def receive_start(self, start_status):
+        self.player_actor.receive_start(start_status)
+
+    def receive_move(self, a_move):
+        self.player_actor.receive_move(a_move)
+
+    def receive_withdrawal_notification(self):
+        self.player_actor.receive_withdrawal_notification()
@@ -0,0 +1,57 @@
+import asyncio
+from .dog_proxy import DogProxy
+
+
+class AsyncDogProxy:
+    # the DogProxy protocol as coroutines: the session state and the handling of the answers are
+    # DogProxy's, only the blocking HTTP requests are moved to the event loop's executor
+    def __init__(self, executor=None, **proxy_options):
+        super().__init__()
+        self.proxy = DogProxy(**proxy_options)
+        self.executor = executor
+
+    def get_proxy(self):
+        return self.proxy
+
+    def get_status(self):
+        return self.proxy.get_status()
+
+    def is_local_player_turn(self):
+        return self.proxy.is_local_player_turn()
+
+    def get_request_statistics(self):
+        return self.proxy.get_request_statistics()
+
+    def close(self):
+        self.proxy.close()
+
+    async def post(self, endpoint, post_data):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.proxy.post, endpoint, post_data)
+
+    async def initialize(self, a_name, an_actor):
+        message = self.proxy.prepare_initialization(a_name, an_actor)
+        if message is not None:
+            return message
+        resp = await self.register_player(self.proxy.player_name, self.proxy.player_id, self.proxy.game_id)
+        return self.proxy.handle_register_player(resp)
+
+    async def register_player(self, a_player_name, a_player_id, a_game_id):
+        post_data = self.proxy.register_player_data(a_player_name, a_player_id, a_game_id)
+        return await self.post("player/", post_data)
+
+    async def start_match(self, number_of_players):
+        resp = await self.post("start/", self.proxy.start_match_data(number_of_players))
+        return self.proxy.handle_start_match(resp)
+
+    async def start_status(self):
+        resp = await self.post("started/", self.proxy.match_data())
+        return self.proxy.handle_start_status(resp)
+
+    async def send_move(self, a_move):
+        resp = await self.post("move/", self.proxy.send_move_data(a_move))
+        return self.proxy.handle_send_move(a_move, resp)
+
+    async def match_status(self):
+        resp = await self.post("match/", self.proxy.match_data())
+        return self.proxy.handle_match_status(resp)
@@ -1,26 +1,47 @@
 import time
-from .dog_proxy import DogProxy
+from .dog_proxy import DogProxy, DOG_SERVER_URL
+from .long_poll_thread import LongPollThread
 from .polling_thread import PollingThread
 
+# how remote moves reach the actor: threads with start(), wake(), stop() and get_statistics()
+TRANSPORTS = {"polling": PollingThread, "long_poll": LongPollThread}
+DEFAULT_TRANSPORT = "polling"
+
 
 class DogActor:
-    def __init__(self):
+    def __init__(self, url=DOG_SERVER_URL, transport=DEFAULT_TRANSPORT):
         super().__init__()
-        self.proxy = DogProxy()
+        self.proxy = DogProxy(url)
         self.player_actor = None
-        self.polling_thread = PollingThread(self.proxy, True)
+        self.transport = TRANSPORTS[transport](self.proxy, True)
 
     def initialize(self, player_name, a_player_actor):
         self.player_actor = a_player_actor
         resp_dict = self.proxy.initialize(player_name, self)
-        self.polling_thread.start()
+        self.transport.start()
         return resp_dict
 
     def start_match(self, number_of_players):
-        return self.proxy.start_match(number_of_players)
+        start_status = self.proxy.start_match(number_of_players)
+        self.transport.wake()
+        return start_status
 
     def send_move(self, move):
-        self.proxy.send_move(move)
+        # whether the move reached the server
+        if self.proxy.send_move(move) is None:
+            return False
+        self.transport.wake()
+        return True
+
+    def get_request_statistics(self):
+        return self.proxy.get_request_statistics()
+
+    def get_polling_statistics(self):
+        return self.transport.get_statistics()
+
+    def close(self):
+        self.transport.stop(timeout=1.0)
+        self.proxy.close()
 
     def receive_start(self, start_status):
         self.player_actor.receive_start(start_status)
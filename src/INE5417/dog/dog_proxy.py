@@ -1,14 +1,67 @@
 # from distutils.command.config import config
 import json
 import pathlib
+import time
 from time import sleep
 from urllib.parse import urldefrag
-import requests
+from threading import Lock
+from .request_statistics import RequestStatistics
 from .start_status import StartStatus
+from ..logic.move_message import (
+    FINISHED,
+    NEXT,
+    get_message_match_status,
+    from_wire,
+    parse_server_dictionary,
+    to_wire,
+)
+
+DOG_SERVER_URL = "https://api-dog-server.herokuapp.com/"
+CONNECT_TIMEOUT = 3.05  # seconds
+READ_TIMEOUT = 10.0  # seconds
+MAX_RETRIES = 2
+RETRY_BACKOFF = 0.25  # seconds, doubled after each retry
+RETRY_STATUS_CODES = (502, 503, 504)
+# endpoints whose requests can be repeated without side effects on the server
+IDEMPOTENT_ENDPOINTS = ("player/", "started/", "match/", "wait/")
+
+player_id_lock = Lock()
+last_player_id = 0
+
+
+def was_request_not_sent(error):
+    # True when the server cannot have seen the request: the connection could not be established, or a
+    # pooled keep-alive connection had already been dropped by the server
+    from http.client import RemoteDisconnected
+    from requests.exceptions import ConnectionError, ConnectTimeout
+    from urllib3.exceptions import MaxRetryError, NewConnectionError, ProtocolError
+
+    if isinstance(error, ConnectTimeout):
+        return True
+    if not isinstance(error, ConnectionError) or not error.args:
+        return False
+    reason = error.args[0]
+    if isinstance(reason, MaxRetryError):
+        reason = reason.reason
+    if isinstance(reason, NewConnectionError):
+        return True
+    if isinstance(reason, ProtocolError):
+        return any(
+            isinstance(argument, (RemoteDisconnected, ConnectionResetError, BrokenPipeError))
+            for argument in reason.args
+        )
+    return False
 
 
 class DogProxy:
-    def __init__(self):
+    def __init__(
+        self,
+        url=DOG_SERVER_URL,
+        connect_timeout=CONNECT_TIMEOUT,
+        read_timeout=READ_TIMEOUT,
+        max_retries=MAX_RETRIES,
+        retry_backoff=RETRY_BACKOFF,
+    ):
         super().__init__()
         self.dog_actor = None
         self.player_id = 0
@@ -17,12 +70,89 @@ class DogProxy:
         self.status = 0
         # 0 - file game.id not found; 1 - not connected to server; 2 - connected without match; 3 - waiting move (even if it's the local player's turn)
         self.move_order = 0
-        self.url = "https://api-dog-server.herokuapp.com/"
+        self.local_turn = False
+        self.long_poll_supported = True
+        self.url = url
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.statistics = RequestStatistics()
+        # created by the first request, so requests and its networking stack are only imported when
+        # the game connects, not while the window is being shown
+        self.session = None
+
+    def get_session(self):
+        # a single keep-alive session, so polling reuses the connection instead of a new TCP+TLS handshake
+        if self.session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self.session = session
+        return self.session
+
+    def get_request_statistics(self):
+        return self.statistics
+
+    def close(self):
+        if self.session is not None:
+            self.session.close()
+
+    def post(self, endpoint, post_data, timeout=None):
+        # None when the server could not be reached; requests that change the server state are only
+        # repeated when the server cannot have received them
+        from requests.exceptions import RequestException
+
+        session = self.get_session()
+        if timeout is None:
+            timeout = self.timeout
+        idempotent = endpoint in IDEMPOTENT_ENDPOINTS
+        url = self.url + endpoint
+        resp = None
+        retries = 0
+        # time spent in the attempts themselves, the waits between them being recorded apart
+        latency = 0.0
+        backoff = 0.0
+        while True:
+            start = time.perf_counter()
+            try:
+                resp = session.post(url, data=post_data, timeout=timeout)
+                should_retry = idempotent and resp.status_code in RETRY_STATUS_CODES
+            except RequestException as error:
+                resp = None
+                should_retry = idempotent or was_request_not_sent(error)
+            latency += time.perf_counter() - start
+            if not should_retry or retries >= self.max_retries:
+                break
+            delay = self.retry_backoff * 2 ** retries
+            sleep(delay)
+            backoff += delay
+            retries += 1
+        succeeded = resp is not None and resp.status_code == 200
+        self.statistics.record(endpoint, latency, succeeded, retries, backoff)
+        return resp
 
     def get_status(self):
         return self.status
 
+    def is_local_player_turn(self):
+        return self.local_turn
+
+    def is_long_poll_supported(self):
+        return self.long_poll_supported
+
     def initialize(self, a_name, an_actor):
+        message = self.prepare_initialization(a_name, an_actor)
+        if message is not None:
+            return message
+        resp = self.register_player(self.player_name, self.player_id, self.game_id)
+        return self.handle_register_player(resp)
+
+    def prepare_initialization(self, a_name, an_actor):
+        # error message when the game can not be registered, None otherwise
         self.player_id = self.generate_player_id()
         self.player_name = a_name
         self.dog_actor = an_actor
@@ -36,9 +166,10 @@ class DogProxy:
             self.status = 0
             return "Arquivo de configuração do jogo não encontrado"
         config_file.close()
-        resp = self.register_player(self.player_name, self.player_id, self.game_id)
-        result = resp.status_code
-        if result == 200:
+        return None
+
+    def handle_register_player(self, resp):
+        if resp is not None and resp.status_code == 200:
             resp_json = resp.text
             resp_dict = json.loads(resp_json)
             resp1 = resp_dict["0"]
@@ -51,32 +182,41 @@ class DogProxy:
         return message
 
     def generate_player_id(self):
+        global last_player_id
         from time import time
 
-        milliseconds = int(time() * 1000)
+        # sessions created in the same millisecond by one process still get different ids
+        with player_id_lock:
+            milliseconds = max(int(time() * 1000), last_player_id + 1)
+            last_player_id = milliseconds
         an_id = str(milliseconds - 1639872000000)
         return an_id
 
-    def register_player(self, a_player_name, a_player_id, a_game_id):
-        url = self.url + "player/"
-        post_data = {
+    def register_player_data(self, a_player_name, a_player_id, a_game_id):
+        return {
             "player_name": a_player_name,
             "player_id": a_player_id,
             "game_id": a_game_id,
         }
-        resp = requests.post(url, data=post_data)
+
+    def register_player(self, a_player_name, a_player_id, a_game_id):
+        post_data = self.register_player_data(a_player_name, a_player_id, a_game_id)
+        resp = self.post("player/", post_data)
         return resp
 
-    def start_match(self, number_of_players):
-        url = self.url + "start/"
-        post_data = {
+    def start_match_data(self, number_of_players):
+        return {
             "player_id": self.player_id,
             "game_id": self.game_id,
             "number_of_players": number_of_players,
         }
-        resp = requests.post(url, data=post_data)
-        result = resp.status_code
-        if result == 200:
+
+    def start_match(self, number_of_players):
+        resp = self.post("start/", self.start_match_data(number_of_players))
+        return self.handle_start_match(resp)
+
+    def handle_start_match(self, resp):
+        if resp is not None and resp.status_code == 200:
             resp_json = resp.text
             resp_dict = json.loads(resp_json)
             message = resp_dict["message"]
@@ -86,16 +226,20 @@ class DogProxy:
             if code == "2":
                 self.status = 3
                 self.move_order = 0
+                self.local_turn = True  #   the player who starts the match moves first
         else:
             start_status = StartStatus("0", "Voce está offline", [], self.player_id)
         return start_status
 
+    def match_data(self):
+        return {"player_id": self.player_id, "game_id": self.game_id}
+
     def start_status(self):
-        url = self.url + "started/"
-        post_data = {"player_id": self.player_id, "game_id": self.game_id}
-        resp = requests.post(url, data=post_data)
-        result = resp.status_code
-        if result == 200 and self.status == 2:
+        resp = self.post("started/", self.match_data())
+        return self.handle_start_status(resp)
+
+    def handle_start_status(self, resp):
+        if resp is not None and resp.status_code == 200 and self.status == 2:
             resp_json = resp.text
             resp_dict = json.loads(resp_json)
             message = resp_dict["message"]
@@ -105,33 +249,51 @@ class DogProxy:
                 start_status = StartStatus(code, message, players, self.player_id)
                 self.status = 3
                 self.move_order = 0
+                self.local_turn = False
                 self.dog_actor.receive_start(start_status)
+                return True
+        return False
 
-    def send_move(self, a_move):
-        url = self.url + "move/"
-        json_move = json.dumps(a_move)  # convert move to json
-        post_data = {
+    def send_move_data(self, a_move):
+        json_move = json.dumps(to_wire(a_move))  # convert the move message to its wire dictionary, in json
+        return {
             "player_id": self.player_id,
             "game_id": self.game_id,
             "move": json_move,
         }
-        resp = requests.post(url, data=post_data)
-        if a_move["match_status"] == "next":
+
+    def send_move(self, a_move):
+        resp = self.post("move/", self.send_move_data(a_move))
+        return self.handle_send_move(a_move, resp)
+
+    def handle_send_move(self, a_move, resp):
+        # None when the move was not delivered: the turn stays with the local player, so it can be sent again
+        if resp is None or resp.status_code != 200:
+            return None
+        self.local_turn = False
+        match_status = get_message_match_status(a_move)
+        if match_status == NEXT:
             self.status = 3  #   pass the turn and start looking for a move
-        elif a_move["match_status"] == "finished":
+        elif match_status == FINISHED:
             self.status = 2  #   connected without match
         return resp.text
 
     def match_status(self):
-        url = self.url + "match/"
-        post_data = {"player_id": self.player_id, "game_id": self.game_id}
-        resp = requests.post(url, data=post_data)
+        resp = self.post("match/", self.match_data())
+        return self.handle_match_status(resp)
+
+    def handle_match_status(self, resp):
+        if resp is None or resp.status_code != 200:
+            return False
         resp_json = resp.text
         seek_result = json.loads(resp_json)
         if bool(seek_result):
-            move_dictionary = eval(
-                seek_result["1"]
-            )  #   move is contained in seek_result as a string (to be converted in dictionary)
+            try:
+                move_dictionary = parse_server_dictionary(
+                    seek_result["1"]
+                )  #   move is contained in seek_result as the string of a dictionary
+            except ValueError:
+                return False
             if bool(move_dictionary):
                 match_status = move_dictionary["match_status"]
                 if (
@@ -139,6 +301,7 @@ class DogProxy:
                 ):  #  an opponent has abandoned the match
                     self.dog_actor.receive_withdrawal_notification()
                     self.status = 2
+                    return True
                 else:
                     move_player_id = move_dictionary["player"]
                     move_player_order = move_dictionary["order"]
@@ -148,7 +311,32 @@ class DogProxy:
                         if (
                             int(move_player_order) > self.move_order
                         ):  #  not an already handled move
+                            try:
+                                move = from_wire(move_dictionary)
+                            except ValueError:
+                                return False
                             self.move_order = int(move_player_order)
-                            self.dog_actor.receive_move(move_dictionary)
-                            if move_dictionary["match_status"] == "finished":
+                            match_status = get_message_match_status(move)
+                            self.local_turn = match_status == NEXT
+                            self.dog_actor.receive_move(move)
+                            if match_status == FINISHED:
                                 self.status = 2
+                            return True
+        return False
+
+    def wait_for_events(self, since, wait_timeout):
+        # long poll: the server answers once the player has something new to fetch through started/ or match/
+        # (or after wait_timeout seconds) with its event counter; None when the request failed
+        post_data = {
+            "player_id": self.player_id,
+            "game_id": self.game_id,
+            "since": since,
+            "timeout": wait_timeout,
+        }
+        connect_timeout, read_timeout = self.timeout
+        resp = self.post("wait/", post_data, timeout=(connect_timeout, read_timeout + wait_timeout))
+        if resp is not None and resp.status_code == 404:
+            self.long_poll_supported = False  #   the DOG server only answers to polling
+        if resp is None or resp.status_code != 200:
+            return None
+        return int(json.loads(resp.text)["events"])
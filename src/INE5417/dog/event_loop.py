@@ -0,0 +1,47 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from threading import Thread
+
+# blocking HTTP requests of all the sessions of the loop run in this many threads at most
+DEFAULT_MAX_WORKERS = 32
+
+
+class EventLoopThread(Thread):
+    # a dedicated asyncio event loop: Tk and other blocking code submit coroutines to it and get
+    # concurrent.futures.Future objects back
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, daemon_value=True):
+        Thread.__init__(self, daemon=daemon_value, name="dog-event-loop")
+        self.loop = asyncio.new_event_loop()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dog-request")
+        self.loop.set_default_executor(self.executor)
+
+    def get_loop(self):
+        return self.loop
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_forever()
+            # lets the pending tasks (e.g. polling loops) handle their cancellation
+            pending = asyncio.all_tasks(self.loop)
+            for task in pending:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        finally:
+            self.loop.close()
+
+    def submit(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def run_coroutine(self, coroutine, timeout=None):
+        # blocks the calling thread, never call it from the loop itself
+        return self.submit(coroutine).result(timeout)
+
+    def call_soon(self, callback, *args):
+        self.loop.call_soon_threadsafe(callback, *args)
+
+    def stop(self, timeout=None):
+        if self.is_alive():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.join(timeout)
+        self.executor.shutdown(wait=False, cancel_futures=True)
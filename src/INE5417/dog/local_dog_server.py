@@ -0,0 +1,370 @@
+import asyncio
+import json
+import time
+from io import BytesIO
+from threading import Event, Lock
+from urllib.parse import parse_qs, urlsplit
+from requests.adapters import BaseAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from .request_statistics import RequestStatistics
+
+# players that did not contact the server for this long are not paired in new matches
+ONLINE_TIMEOUT = 15.0  # seconds
+# wait/ answers as soon as something happens to the player, or after the requested timeout, at most this
+MAX_WAIT_TIMEOUT = 60.0  # seconds
+ENDPOINTS = ("player/", "start/", "started/", "move/", "match/", "wait/")
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found"}
+
+
+class LocalPlayer:
+    def __init__(self, name, player_id, game_id):
+        self.name = name
+        self.player_id = player_id
+        self.game_id = game_id
+        self.last_seen = time.monotonic()
+        self.match = None
+        self.start_pending = False  #   the match was started by someone else and not reported yet
+        self.events = 0  #   matches started, moves and withdrawals the player has to fetch, for wait/
+        self.waiters = []
+
+
+class LocalMatch:
+    def __init__(self, players):
+        self.players = players  #   LocalPlayer objects, in move order
+        self.last_move = None
+        self.move_order = 0
+        self.finished = False
+
+    def get_players_info(self, first_player):
+        # [name, id, order] of every player, the one the answer is for first
+        players_info = [
+            [player.name, player.player_id, str(order)] for order, player in enumerate(self.players, start=1)
+        ]
+        index = self.players.index(first_player)
+        return players_info[index:index + 1] + players_info[:index] + players_info[index + 1:]
+
+
+class LocalDogServer:
+    # in-memory stand-in for the DOG server, with the endpoints and answers DogProxy expects;
+    # it can be reached in-process through LocalDogAdapter or on localhost through LocalDogHttpServer
+    def __init__(self, online_timeout=ONLINE_TIMEOUT):
+        super().__init__()
+        self.online_timeout = online_timeout
+        self.lock = Lock()
+        self.players = {}
+        self.waiting_players = {}  #   game_id -> {player_id: LocalPlayer} of the players without a match
+        self.matches_started = 0
+        self.moves_received = 0
+        self.statistics = RequestStatistics()
+
+    def get_statistics(self):
+        return self.statistics
+
+    def get_number_of_players(self):
+        return len(self.players)
+
+    def get_matches_started(self):
+        return self.matches_started
+
+    def get_moves_received(self):
+        return self.moves_received
+
+    def handle(self, endpoint, post_data):
+        # answers one request: endpoint is one of ENDPOINTS (wait/ goes through wait_for_events), post_data
+        # maps the form fields to strings; returns the HTTP status code and the body
+        start = time.perf_counter()
+        handlers = {
+            "player/": self.register_player,
+            "start/": self.start_match,
+            "started/": self.start_status,
+            "move/": self.receive_move,
+            "match/": self.match_status,
+        }
+        handler = handlers.get(endpoint)
+        if handler is None:
+            status_code, body = 404, "{}"
+        else:
+            try:
+                with self.lock:
+                    status_code, body = 200, handler(post_data)
+            except (KeyError, ValueError):
+                status_code, body = 400, "{}"
+        self.statistics.record(endpoint, time.perf_counter() - start, status_code == 200, 0)
+        return status_code, body
+
+    def handle_form(self, endpoint, body):
+        return self.handle(endpoint, parse_form(body))
+
+    def notify(self, player):
+        # called with the lock held whenever started/ or match/ would give the player something new
+        player.events += 1
+        waiters = player.waiters
+        player.waiters = []
+        for waiter in waiters:
+            waiter()
+
+    def notify_opponents(self, match, player):
+        for match_player in match.players:
+            if match_player is not player:
+                self.notify(match_player)
+
+    def start_wait(self, post_data, waiter):
+        # the body of the wait/ answer when there already is news for the player; otherwise registers
+        # waiter, called once from any thread when there is, and returns None
+        with self.lock:
+            player = self.get_player(post_data)
+            if player.events != int(post_data["since"]):
+                return json.dumps({"events": str(player.events)})
+            player.waiters.append(waiter)
+            return None
+
+    def finish_wait(self, post_data, waiter):
+        with self.lock:
+            player = self.get_player(post_data)
+            if waiter in player.waiters:
+                player.waiters.remove(waiter)
+            return json.dumps({"events": str(player.events)})
+
+    def get_wait_timeout(self, post_data):
+        return min(float(post_data.get("timeout", MAX_WAIT_TIMEOUT)), MAX_WAIT_TIMEOUT)
+
+    def wait_for_events(self, post_data):
+        # blocking wait/ for the threads of LocalDogAdapter
+        start = time.perf_counter()
+        try:
+            event = Event()
+            body = self.start_wait(post_data, event.set)
+            if body is None:
+                event.wait(self.get_wait_timeout(post_data))
+                body = self.finish_wait(post_data, event.set)
+            status_code = 200
+        except (KeyError, ValueError):
+            status_code, body = 400, "{}"
+        self.statistics.record("wait/", time.perf_counter() - start, status_code == 200, 0)
+        return status_code, body
+
+    async def wait_for_events_async(self, post_data):
+        # wait/ for the asyncio front end, which must not block its loop
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            event = asyncio.Event()
+
+            def waiter():
+                loop.call_soon_threadsafe(event.set)
+
+            body = self.start_wait(post_data, waiter)
+            if body is None:
+                try:
+                    await asyncio.wait_for(event.wait(), self.get_wait_timeout(post_data))
+                except asyncio.TimeoutError:
+                    pass
+                body = self.finish_wait(post_data, waiter)
+            status_code = 200
+        except (KeyError, ValueError):
+            status_code, body = 400, "{}"
+        self.statistics.record("wait/", time.perf_counter() - start, status_code == 200, 0)
+        return status_code, body
+
+    def get_player(self, post_data):
+        player = self.players[post_data["player_id"]]
+        player.last_seen = time.monotonic()
+        return player
+
+    def leave_match(self, player):
+        # a player that registers again or starts a new match abandons the one in progress
+        match = player.match
+        if match is not None and not match.finished:
+            match.finished = True
+            match.last_move = {"match_status": "interrupted"}
+            self.notify_opponents(match, player)
+        player.match = None
+        player.start_pending = False
+
+    def register_player(self, post_data):
+        player_id = post_data["player_id"]
+        player = self.players.get(player_id)
+        if player is not None:
+            self.leave_match(player)
+            self.waiting_players.get(player.game_id, {}).pop(player_id, None)
+        player = LocalPlayer(post_data["player_name"], player_id, post_data["game_id"])
+        self.players[player_id] = player
+        self.waiting_players.setdefault(player.game_id, {})[player_id] = player
+        return json.dumps({"0": "Jogador registrado", "1": player_id})
+
+    def start_match(self, post_data):
+        player = self.players.get(post_data["player_id"])
+        if player is None:
+            return json.dumps({"code": "0", "message": "Jogador não registrado", "players": []})
+        player.last_seen = time.monotonic()
+        number_of_players = int(post_data["number_of_players"])
+        waiting = self.waiting_players.setdefault(player.game_id, {})
+        now = time.monotonic()
+        opponents = []
+        for candidate in waiting.values():
+            if candidate is not player and now - candidate.last_seen <= self.online_timeout:
+                opponents.append(candidate)
+                if len(opponents) == number_of_players - 1:
+                    break
+        if len(opponents) < number_of_players - 1:
+            return json.dumps({"code": "1", "message": "Jogadores insuficientes", "players": []})
+
+        match = LocalMatch([player] + opponents)
+        for match_player in match.players:
+            self.leave_match(match_player)
+            waiting.pop(match_player.player_id, None)
+            match_player.match = match
+            match_player.start_pending = match_player is not player
+        self.notify_opponents(match, player)
+        self.matches_started += 1
+        return json.dumps({"code": "2", "message": "Partida iniciada", "players": match.get_players_info(player)})
+
+    def start_status(self, post_data):
+        player = self.get_player(post_data)
+        if not player.start_pending:
+            return json.dumps({"code": "1", "message": "Aguardando início de partida", "players": []})
+        player.start_pending = False
+        match = player.match
+        return json.dumps({"code": "2", "message": "Partida iniciada", "players": match.get_players_info(player)})
+
+    def receive_move(self, post_data):
+        player = self.get_player(post_data)
+        match = player.match
+        if match is None or match.finished:
+            return "Partida encerrada"
+        move = json.loads(post_data["move"])
+        match.move_order += 1
+        move["player"] = player.player_id
+        move["order"] = str(match.move_order)
+        match.last_move = move
+        self.moves_received += 1
+        self.notify_opponents(match, player)
+        if move.get("match_status") == "finished":
+            match.finished = True
+            # the players can be paired again, the last move stays readable until they are
+            for match_player in match.players:
+                self.waiting_players.setdefault(match_player.game_id, {})[match_player.player_id] = match_player
+        return "Jogada registrada"
+
+    def match_status(self, post_data):
+        player = self.get_player(post_data)
+        match = player.match
+        if match is None or match.last_move is None:
+            return json.dumps({})
+        #   the move goes as the string of a dictionary, as in the DOG server
+        return json.dumps({"1": str(match.last_move)})
+
+
+def parse_form(body):
+    # the form is url-encoded, as requests sends the data argument of post()
+    if isinstance(body, bytes):
+        body = body.decode()
+    fields = parse_qs(body or "", keep_blank_values=True)
+    return {name: values[-1] for name, values in fields.items()}
+
+
+class LocalDogAdapter(BaseAdapter):
+    # transport adapter that answers a requests.Session with a LocalDogServer, without sockets
+    def __init__(self, server):
+        super().__init__()
+        self.server = server
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        endpoint = urlsplit(request.url).path.rstrip("/").rsplit("/", 1)[-1] + "/"
+        if endpoint == "wait/":
+            status_code, body = self.server.wait_for_events(parse_form(request.body))
+        else:
+            status_code, body = self.server.handle_form(endpoint, request.body)
+        response = Response()
+        response.status_code = status_code
+        response.reason = HTTP_REASONS.get(status_code, "")
+        response.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
+        response.raw = BytesIO(body.encode())
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def connect_proxy(server, proxy):
+    # routes every request of a DogProxy to the in-process server
+    proxy.get_session().mount(proxy.url, LocalDogAdapter(server))
+
+
+class LocalDogHttpServer:
+    # HTTP/1.1 front end with keep-alive connections, so that thousands of clients are served by one thread
+    def __init__(self, server, host="127.0.0.1", port=0):
+        super().__init__()
+        self.server = server
+        self.host = host
+        self.port = port
+        self.asyncio_server = None
+        self.open_connections = 0
+
+    def get_url(self):
+        return f"http://{self.host}:{self.port}/"
+
+    def get_open_connections(self):
+        return self.open_connections
+
+    async def start(self):
+        self.asyncio_server = await asyncio.start_server(self.handle_connection, self.host, self.port, backlog=4096)
+        self.port = self.asyncio_server.sockets[0].getsockname()[1]
+        return self.get_url()
+
+    async def serve_forever(self):
+        if self.asyncio_server is None:
+            await self.start()
+        await self.asyncio_server.serve_forever()
+
+    async def stop(self):
+        if self.asyncio_server is not None:
+            self.asyncio_server.close()
+            await self.asyncio_server.wait_closed()
+            self.asyncio_server = None
+
+    async def handle_connection(self, reader, writer):
+        self.open_connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+
+                endpoint = urlsplit(target).path.rstrip("/").rsplit("/", 1)[-1] + "/"
+                if method == "POST" and endpoint == "wait/":
+                    status_code, text = await self.server.wait_for_events_async(parse_form(body))
+                elif method == "POST":
+                    status_code, text = self.server.handle_form(endpoint, body)
+                else:
+                    status_code, text = 404, "{}"
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                payload = text.encode()
+                writer.write(
+                    f"{version} {status_code} {HTTP_REASONS.get(status_code, '')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1")
+                    + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            self.open_connections -= 1
+            writer.close()
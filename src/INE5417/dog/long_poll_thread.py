@@ -0,0 +1,65 @@
+from threading import Event, Thread
+from .polling_thread import PollingSchedule
+
+# seconds the server may hold a wait/ request when nothing happens
+LONG_POLL_TIMEOUT = 25.0
+RETRY_INTERVAL = 1.0
+OFFLINE_INTERVAL = 5.0
+
+
+class LongPollThread(Thread):
+    # push-style transport: a wait/ request stays open on the server until the opponent moves, starts a
+    # match or leaves, so moves are fetched right away and an idle client makes a request every
+    # LONG_POLL_TIMEOUT seconds; falls back to adaptive polling when the server has no wait/
+    def __init__(self, a_proxy, daemon_value):
+        Thread.__init__(self, daemon=daemon_value)
+        self.proxy = a_proxy
+        self.schedule = PollingSchedule(a_proxy)
+        self.wake_event = Event()
+        self.stopped = False
+        self.last_event = 0
+
+    def get_statistics(self):
+        return self.schedule.get_statistics()
+
+    def wake(self):
+        self.schedule.wake()
+        self.wake_event.set()
+
+    def stop(self, timeout=None):
+        # a pending wait/ request is not interrupted, the thread ends when it returns
+        self.stopped = True
+        self.wake_event.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def run(self):
+        while not self.stopped:
+            self.wake_event.clear()
+            status = self.proxy.get_status()
+            if status != 2 and status != 3:
+                self.wake_event.wait(OFFLINE_INTERVAL)
+            elif not self.proxy.is_long_poll_supported():
+                self.fetch()
+                self.wake_event.wait(self.schedule.next_interval())
+            else:
+                self.get_statistics().record_request("wait/")
+                events = self.proxy.wait_for_events(self.last_event, LONG_POLL_TIMEOUT)
+                if events is None:
+                    self.wake_event.wait(RETRY_INTERVAL)
+                elif events != self.last_event:
+                    self.last_event = events
+                    self.fetch()
+
+    def fetch(self):
+        if self.stopped:
+            return
+        status = self.proxy.get_status()
+        if status == 2:  #   connected without match
+            self.get_statistics().record_request("started/")
+            if self.proxy.start_status():
+                self.schedule.wake()
+        elif status == 3:  #   a move or a withdrawal
+            local_turn, now = self.schedule.before_match_poll()
+            received = self.proxy.match_status()
+            self.schedule.after_match_poll(local_turn, now, received)
@@ -1,17 +1,152 @@
-from threading import Thread
+from threading import Event, Lock, Thread
 import time
 
+# seconds between requests: fast right after a move was sent, growing while nothing happens
+FAST_POLLING_INTERVAL = 0.1
+MAX_MATCH_POLLING_INTERVAL = 2.0
+START_POLLING_INTERVAL = 1.0
+MAX_START_POLLING_INTERVAL = 4.0
+BACKOFF_FACTOR = 1.5
+# while the local player thinks there is no move to wait for, only withdrawals are checked
+LOCAL_TURN_POLLING_INTERVAL = 5.0
+OFFLINE_POLLING_INTERVAL = 5.0
+
+
+class PollingStatistics:
+    def __init__(self):
+        self.lock = Lock()
+        self.requests = {"started/": 0, "match/": 0}
+        self.moves_received = 0
+        self.total_move_latency = 0.0
+        self.max_move_latency = 0.0
+        self.total_detection_delay = 0.0
+
+    def record_request(self, endpoint):
+        with self.lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+
+    def record_move(self, move_latency, detection_delay):
+        # move_latency: from handing the turn to the remote player to seeing their move;
+        # detection_delay: upper bound of how long the move may have waited on the server
+        with self.lock:
+            self.moves_received += 1
+            self.total_move_latency += move_latency
+            self.max_move_latency = max(self.max_move_latency, move_latency)
+            self.total_detection_delay += detection_delay
+
+    def get_requests(self):
+        return dict(self.requests)
+
+    def get_moves_received(self):
+        return self.moves_received
+
+    def get_mean_move_latency(self):
+        if self.moves_received == 0:
+            return 0.0
+        return self.total_move_latency / self.moves_received
+
+    def get_max_move_latency(self):
+        return self.max_move_latency
+
+    def get_mean_detection_delay(self):
+        if self.moves_received == 0:
+            return 0.0
+        return self.total_detection_delay / self.moves_received
+
+    def __repr__(self):
+        return (
+            f"requests={self.requests} moves={self.moves_received} "
+            f"move latency mean={self.get_mean_move_latency() * 1000:.0f} ms "
+            f"max={self.max_move_latency * 1000:.0f} ms "
+            f"detection delay mean={self.get_mean_detection_delay() * 1000:.0f} ms"
+        )
+
+
+class PollingSchedule:
+    # decides when the next request is due; shared by PollingThread and the asyncio client
+    def __init__(self, a_proxy):
+        self.proxy = a_proxy
+        self.statistics = PollingStatistics()
+        # interval and waiting_since are set by wake() on the Tk and outbound threads while the polling
+        # thread updates them
+        self.lock = Lock()
+        self.interval = START_POLLING_INTERVAL
+        self.waiting_since = time.perf_counter()
+        self.last_poll = self.waiting_since
+
+    def get_statistics(self):
+        return self.statistics
+
+    def wake(self):
+        # called after a move was sent or a match started: the answer is expected soon
+        with self.lock:
+            self.interval = FAST_POLLING_INTERVAL
+            self.waiting_since = time.perf_counter()
+
+    def before_match_poll(self):
+        self.statistics.record_request("match/")
+        return self.proxy.is_local_player_turn(), time.perf_counter()
+
+    def after_match_poll(self, local_turn, now, received):
+        with self.lock:
+            waiting_since = self.waiting_since
+        if received and not local_turn and self.proxy.is_local_player_turn():
+            self.statistics.record_move(now - waiting_since, now - max(self.last_poll, waiting_since))
+        self.last_poll = now
+
+    def next_interval(self):
+        status = self.proxy.get_status()
+        if status == 2:
+            with self.lock:
+                interval = max(self.interval, START_POLLING_INTERVAL)
+                self.interval = min(interval * BACKOFF_FACTOR, MAX_START_POLLING_INTERVAL)
+            return interval
+        if status == 3:
+            if self.proxy.is_local_player_turn():
+                return LOCAL_TURN_POLLING_INTERVAL
+            with self.lock:
+                interval = self.interval
+                self.interval = min(self.interval * BACKOFF_FACTOR, MAX_MATCH_POLLING_INTERVAL)
+            return interval
+        return OFFLINE_POLLING_INTERVAL
+
 
 class PollingThread(Thread):
     def __init__(self, a_proxy, daemon_value):
         Thread.__init__(self, daemon=daemon_value)
         self.proxy = a_proxy
+        self.schedule = PollingSchedule(a_proxy)
+        self.wake_event = Event()
+        self.stopped = False
+
+    def get_statistics(self):
+        return self.schedule.get_statistics()
+
+    def wake(self):
+        self.schedule.wake()
+        self.wake_event.set()
+
+    def stop(self, timeout=None):
+        self.stopped = True
+        self.wake_event.set()
+        if self.is_alive():
+            self.join(timeout)
 
     def run(self):
-        while True:
-            status = self.proxy.get_status()
-            if status == 2:  #   connected without match
-                self.proxy.start_status()
-            elif status == 3:  #   waiting remote move
-                self.proxy.match_status()
-            time.sleep(1)  # Sleep for 1 second
+        while not self.stopped:
+            self.wake_event.clear()
+            self.poll()
+            if self.stopped:
+                break
+            self.wake_event.wait(self.schedule.next_interval())
+
+    def poll(self):
+        status = self.proxy.get_status()
+        if status == 2:  #   connected without match
+            self.schedule.get_statistics().record_request("started/")
+            if self.proxy.start_status():
+                self.wake()
+        elif status == 3:  #   waiting remote move
+            local_turn, now = self.schedule.before_match_poll()
+            received = self.proxy.match_status()
+            self.schedule.after_match_poll(local_turn, now, received)
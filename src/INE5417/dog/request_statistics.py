@@ -0,0 +1,59 @@
+from threading import Lock
+
+
+class EndpointStatistics:
+    def __init__(self) -> None:
+        self.requests = 0
+        self.failures = 0
+        self.retries = 0
+        # time waited between retries, kept out of the latencies
+        self.total_backoff = 0.0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def get_mean_latency(self) -> float:
+        if self.requests == 0:
+            return 0.0
+        return self.total_latency / self.requests
+
+    def __repr__(self) -> str:
+        return (
+            f"requests={self.requests} failures={self.failures} retries={self.retries} "
+            f"mean={self.get_mean_latency() * 1000:.1f} ms max={self.max_latency * 1000:.1f} ms "
+            f"backoff={self.total_backoff * 1000:.1f} ms"
+        )
+
+
+class RequestStatistics:
+    # latency counters per DOG endpoint, shared by the GUI and the polling threads
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.endpoints: dict[str, EndpointStatistics] = {}
+
+    def record(self, endpoint: str, latency: float, succeeded: bool, retries: int, backoff: float = 0.0) -> None:
+        with self.lock:
+            statistics = self.endpoints.get(endpoint)
+            if statistics is None:
+                statistics = EndpointStatistics()
+                self.endpoints[endpoint] = statistics
+            statistics.requests += 1
+            statistics.retries += retries
+            statistics.total_backoff += backoff
+            statistics.total_latency += latency
+            if latency > statistics.max_latency:
+                statistics.max_latency = latency
+            if not succeeded:
+                statistics.failures += 1
+
+    def get_endpoint_statistics(self, endpoint: str) -> EndpointStatistics | None:
+        return self.endpoints.get(endpoint)
+
+    def get_endpoints(self) -> list[str]:
+        return list(self.endpoints)
+
+    def reset(self) -> None:
+        with self.lock:
+            self.endpoints = {}
+
+    def __repr__(self) -> str:
+        return "\n".join(f"{endpoint:<10} {statistics}" for endpoint, statistics in self.endpoints.items())
@@ -0,0 +1,216 @@
+import time
+
+from .transposition_table import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+from ..logic.move import NO_MOVE
+from ..logic.move_generator import MAX_MOVES, generate_moves
+from ..logic.position import Position
+
+MAX_DEPTH: int = 64
+WIN_SCORE: int = 10000
+INFINITE_SCORE: int = WIN_SCORE + 1
+WIN_THRESHOLD: int = WIN_SCORE - MAX_DEPTH
+NODES_BETWEEN_TIME_CHECKS: int = 1024
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class SearchResult:
+    def __init__(self, best_move: int, score: int, depth: int, nodes: int, elapsed: float) -> None:
+        self.best_move: int = best_move
+        self.score: int = score
+        self.depth: int = depth
+        self.nodes: int = nodes
+        self.elapsed: float = elapsed
+
+    def get_best_move(self) -> int:
+        return self.best_move
+
+    def get_score(self) -> int:
+        return self.score
+
+    def get_depth(self) -> int:
+        return self.depth
+
+    def get_nodes(self) -> int:
+        return self.nodes
+
+    def get_elapsed(self) -> float:
+        return self.elapsed
+
+    def get_nodes_per_second(self) -> float:
+        if self.elapsed <= 0:
+            return 0.0
+        return self.nodes / self.elapsed
+
+    def __repr__(self) -> str:
+        return (
+            f"SearchResult(move={self.best_move}, score={self.score}, depth={self.depth}, "
+            f"nodes={self.nodes}, {self.get_nodes_per_second():,.0f} nodes/s)"
+        )
+
+
+class AlphaBetaSearch:
+    def __init__(self, time_budget: float, transposition_table: TranspositionTable | None = None) -> None:
+        if transposition_table is None:
+            transposition_table = TranspositionTable()
+        self.time_budget: float = time_budget
+        self.transposition_table: TranspositionTable = transposition_table
+        self.deadline: float = 0.0
+        self.nodes: int = 0
+        self.move_buffers: list[list[int]] = [[0] * MAX_MOVES for _ in range(MAX_DEPTH + 1)]
+        self.killer_moves: list[list[int]] = [[NO_MOVE, NO_MOVE] for _ in range(MAX_DEPTH + 1)]
+
+    def set_time_budget(self, time_budget: float) -> None:
+        self.time_budget = time_budget
+
+    def get_time_budget(self) -> float:
+        return self.time_budget
+
+    def get_transposition_table(self) -> TranspositionTable:
+        return self.transposition_table
+
+    def search(self, position: Position) -> SearchResult:
+        start = time.perf_counter()
+        self.deadline = start + self.time_budget
+        self.nodes = 0
+        self.transposition_table.new_search()
+        for killers in self.killer_moves:
+            killers[0] = NO_MOVE
+            killers[1] = NO_MOVE
+
+        # the search mutates its own copy, which is simply dropped if the time runs out mid-iteration
+        position = position.copy()
+        moves = [0] * MAX_MOVES
+        count = generate_moves(position, moves)
+        if count == 0:
+            return SearchResult(NO_MOVE, -WIN_SCORE, 0, 0, time.perf_counter() - start)
+        root_moves = moves[:count]
+
+        best_move = root_moves[0]
+        best_score = 0
+        depth_reached = 0
+        for depth in range(1, MAX_DEPTH + 1):
+            try:
+                score, move = self.search_root(position, root_moves, depth)
+            except SearchTimeout:
+                break
+            best_move = move
+            best_score = score
+            depth_reached = depth
+            # the best move of an iteration is searched first in the next one
+            root_moves.remove(move)
+            root_moves.insert(0, move)
+            if count == 1 or abs(score) >= WIN_THRESHOLD:
+                break
+        return SearchResult(best_move, best_score, depth_reached, self.nodes, time.perf_counter() - start)
+
+    def search_root(self, position: Position, root_moves: list[int], depth: int) -> tuple[int, int]:
+        alpha = -INFINITE_SCORE
+        best_move = root_moves[0]
+        for move in root_moves:
+            undo = position.make_move(move)
+            score = -self.negamax(position, depth - 1, -INFINITE_SCORE, -alpha, 1)
+            position.unmake_move(move, undo)
+            if score > alpha:
+                alpha = score
+                best_move = move
+        self.transposition_table.store(
+            position.zobrist_key, depth, self.score_to_table(alpha, 0), EXACT, best_move
+        )
+        return alpha, best_move
+
+    def negamax(self, position: Position, depth: int, alpha: int, beta: int, ply: int) -> int:
+        self.nodes += 1
+        if self.nodes % NODES_BETWEEN_TIME_CHECKS == 0 and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+        zobrist_key = position.zobrist_key
+        table_move = NO_MOVE
+        if depth > 0:
+            entry = self.transposition_table.probe(zobrist_key)
+            if entry is not None:
+                table_move = entry[4]
+                if entry[1] >= depth:
+                    score = self.score_from_table(entry[2], ply)
+                    bound = entry[3]
+                    if (
+                        bound == EXACT
+                        or (bound == LOWER_BOUND and score >= beta)
+                        or (bound == UPPER_BOUND and score <= alpha)
+                    ):
+                        return score
+
+        moves = self.move_buffers[ply]
+        count = generate_moves(position, moves)
+        if count == 0:
+            # the side to move is blocked and loses, the sooner the better for the opponent
+            return -WIN_SCORE + ply
+        if depth == 0:
+            return self.evaluate(position, count)
+
+        self.order_moves(moves, count, ply, table_move)
+        original_alpha = alpha
+        best_score = -INFINITE_SCORE
+        best_move = NO_MOVE
+        for i in range(count):
+            move = moves[i]
+            undo = position.make_move(move)
+            score = -self.negamax(position, depth - 1, -beta, -alpha, ply + 1)
+            position.unmake_move(move, undo)
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if score >= beta:
+                        self.store_killer_move(move, ply)
+                        break
+
+        if best_score >= beta:
+            bound = LOWER_BOUND
+        elif best_score > original_alpha:
+            bound = EXACT
+        else:
+            bound = UPPER_BOUND
+        self.transposition_table.store(zobrist_key, depth, self.score_to_table(best_score, ply), bound, best_move)
+        return best_score
+
+    def score_to_table(self, score: int, ply: int) -> int:
+        # win scores are stored relative to the node so they stay valid wherever it is reached from
+        if score >= WIN_THRESHOLD:
+            return score + ply
+        if score <= -WIN_THRESHOLD:
+            return score - ply
+        return score
+
+    def score_from_table(self, score: int, ply: int) -> int:
+        if score >= WIN_THRESHOLD:
+            return score - ply
+        if score <= -WIN_THRESHOLD:
+            return score + ply
+        return score
+
+    def evaluate(self, position: Position, number_of_moves: int) -> int:
+        # mobility of the side to move: the game is lost by running out of legal moves
+        return number_of_moves
+
+    def order_moves(self, moves: list[int], count: int, ply: int, table_move: int) -> None:
+        # the transposition table move goes first, followed by the killer moves of this ply
+        front = 0
+        for preferred_move in (table_move, self.killer_moves[ply][0], self.killer_moves[ply][1]):
+            if preferred_move == NO_MOVE:
+                continue
+            for i in range(front, count):
+                if moves[i] == preferred_move:
+                    moves[i] = moves[front]
+                    moves[front] = preferred_move
+                    front += 1
+                    break
+
+    def store_killer_move(self, move: int, ply: int) -> None:
+        killers = self.killer_moves[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
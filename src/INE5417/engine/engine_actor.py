@@ -0,0 +1,65 @@
+from threading import Thread
+
+from .alpha_beta import AlphaBetaSearch, SearchResult
+from ..dog.start_status import StartStatus
+from ..logic.board import Board
+from ..logic.move import NO_MOVE, decode_move
+from ..utils.game_state import GameState
+from ..utils.move_type import MoveType
+
+ENGINE_PLAYER_NAME = "Computador"
+ENGINE_PLAYER_ID = "0"
+
+
+class EngineActor:
+    # stands in for DogActor: the moves of the local player are answered by the search engine
+    # instead of the DOG server, and delivered back through the player actor's receive_move
+    def __init__(self, time_budget: float) -> None:
+        self.player_actor = None
+        self.player_name: str = ""
+        self.board: Board = Board()
+        self.search: AlphaBetaSearch = AlphaBetaSearch(time_budget)
+        self.last_search_result: SearchResult | None = None
+
+    def initialize(self, player_name, a_player_actor):
+        self.player_actor = a_player_actor
+        self.player_name = player_name or "player"
+        return f"Jogando contra o computador ({self.search.get_time_budget():g} s por jogada)"
+
+    def start_match(self, number_of_players):
+        local_player = [self.player_name, "1", "1"]
+        engine_player = [ENGINE_PLAYER_NAME, ENGINE_PLAYER_ID, "2"]
+        self.board.start_match([engine_player, local_player])
+        self.board.set_game_state(GameState.REMOTE_PLAYER_TO_MOVE)
+        return StartStatus("2", "Partida iniciada contra o computador", [local_player, engine_player], "1")
+
+    def send_move(self, move):
+        self.board.receive_move(move)
+        if self.board.get_game_state() == GameState.LOCAL_PLAYER_TO_MOVE:
+            Thread(target=self.play_engine_move, daemon=True).start()
+        return True
+
+    def play_engine_move(self) -> None:
+        position = self.board.to_position()
+        self.last_search_result = self.search.search(position)
+        best_move = self.last_search_result.get_best_move()
+        if best_move == NO_MOVE:
+            # blocked without a legal move, the engine leaves the match
+            self.player_actor.receive_withdrawal_notification()
+            return
+        move_type, triangle_index, stone_value = decode_move(best_move)
+        if move_type == MoveType.INSERT:
+            self.board.stone_selected(stone_value, True)
+        self.board.position_selected(triangle_index)
+        self.board.perform_game_over_verification()
+        self.receive_move(self.board.get_move_to_send())
+
+    def close(self) -> None:
+        # nothing to release: the search threads are daemons and end with the game
+        pass
+
+    def get_last_search_result(self) -> SearchResult | None:
+        return self.last_search_result
+
+    def receive_move(self, a_move):
+        self.player_actor.receive_move(a_move)
@@ -0,0 +1,200 @@
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ..logic.move import NO_MOVE
+from ..logic.move_generator import MAX_MOVES, generate_moves
+from ..logic.position import Position
+
+DEFAULT_EXPLORATION: float = 1.4
+MAX_PLAYOUT_PLIES: int = 200
+DRAW: int = -1
+
+
+class MctsNode:
+    __slots__ = ("move", "parent", "children", "untried_moves", "player", "visits", "wins")
+
+    def __init__(self, move: int, parent: "MctsNode | None", untried_moves: list[int], player: int) -> None:
+        self.move: int = move
+        self.parent: MctsNode | None = parent
+        self.children: list[MctsNode] = []
+        self.untried_moves: list[int] = untried_moves
+        # color index of the player who made the move leading to this node, whose wins are counted here
+        self.player: int = player
+        self.visits: int = 0
+        self.wins: float = 0.0
+
+    def select_child(self, exploration: float) -> "MctsNode":
+        log_visits = math.log(self.visits)
+        best_child = self.children[0]
+        best_value = -1.0
+        for child in self.children:
+            value = child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits)
+            if value > best_value:
+                best_value = value
+                best_child = child
+        return best_child
+
+
+def play_out(position: Position, generator: random.Random, moves: list[int]) -> int:
+    for _ in range(MAX_PLAYOUT_PLIES):
+        count = generate_moves(position, moves)
+        if count == 0:
+            return position.turn ^ 1
+        position.make_move(moves[generator.randrange(count)])
+    return DRAW
+
+
+def run_playouts(
+    position_key: int, time_budget: float, seed: int, exploration: float
+) -> tuple[dict[int, tuple[int, float]], int]:
+    # worker entry point: receives and returns only integers, so nothing but the position key crosses
+    # the process boundary; returns the visits and wins of every root move and the number of playouts
+    deadline = time.perf_counter() + time_budget
+    generator = random.Random(seed)
+    root_position = Position.from_key(position_key)
+    moves = [0] * MAX_MOVES
+    count = generate_moves(root_position, moves)
+    root = MctsNode(NO_MOVE, None, moves[:count], root_position.turn ^ 1)
+    playouts = 0
+    while count > 0 and (playouts == 0 or time.perf_counter() < deadline):
+        position = root_position.copy()
+        node = root
+        while not node.untried_moves and node.children:
+            node = node.select_child(exploration)
+            position.make_move(node.move)
+        if node.untried_moves:
+            untried_moves = node.untried_moves
+            i = generator.randrange(len(untried_moves))
+            move = untried_moves[i]
+            untried_moves[i] = untried_moves[-1]
+            untried_moves.pop()
+            player = position.turn
+            position.make_move(move)
+            child_count = generate_moves(position, moves)
+            child = MctsNode(move, node, moves[:child_count], player)
+            node.children.append(child)
+            node = child
+        winner = play_out(position, generator, moves)
+        playouts += 1
+        while node is not None:
+            node.visits += 1
+            if winner == DRAW:
+                node.wins += 0.5
+            elif winner == node.player:
+                node.wins += 1.0
+            node = node.parent
+    statistics = {child.move: (child.visits, child.wins) for child in root.children}
+    return statistics, playouts
+
+
+class MctsResult:
+    def __init__(self, best_move: int, visits: int, win_rate: float, playouts: int, elapsed: float, workers: int) -> None:
+        self.best_move: int = best_move
+        self.visits: int = visits
+        self.win_rate: float = win_rate
+        self.playouts: int = playouts
+        self.elapsed: float = elapsed
+        self.workers: int = workers
+
+    def get_best_move(self) -> int:
+        return self.best_move
+
+    def get_visits(self) -> int:
+        return self.visits
+
+    def get_win_rate(self) -> float:
+        return self.win_rate
+
+    def get_playouts(self) -> int:
+        return self.playouts
+
+    def get_elapsed(self) -> float:
+        return self.elapsed
+
+    def get_workers(self) -> int:
+        return self.workers
+
+    def get_playouts_per_second(self) -> float:
+        if self.elapsed <= 0:
+            return 0.0
+        return self.playouts / self.elapsed
+
+    def __repr__(self) -> str:
+        return (
+            f"MctsResult(move={self.best_move}, win_rate={self.win_rate:.2f}, playouts={self.playouts}, "
+            f"workers={self.workers}, {self.get_playouts_per_second():,.0f} playouts/s)"
+        )
+
+
+class MonteCarloTreeSearch:
+    # root parallelism: every worker process grows its own tree from the same root for the whole time
+    # budget and the root move statistics are summed at the end
+    def __init__(
+        self, time_budget: float, workers: int | None = None, exploration: float = DEFAULT_EXPLORATION, seed: int | None = None
+    ) -> None:
+        if workers is None:
+            workers = os.cpu_count() or 1
+        self.time_budget: float = time_budget
+        self.workers: int = workers
+        self.exploration: float = exploration
+        self.generator: random.Random = random.Random(seed)
+        self.executor: ProcessPoolExecutor | None = None
+
+    def get_time_budget(self) -> float:
+        return self.time_budget
+
+    def get_workers(self) -> int:
+        return self.workers
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self.executor
+
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __enter__(self) -> "MonteCarloTreeSearch":
+        return self
+
+    def __exit__(self, *exception_info) -> None:
+        self.close()
+
+    def search(self, position: Position) -> MctsResult:
+        start = time.perf_counter()
+        position_key = position.key()
+        seeds = [self.generator.getrandbits(32) for _ in range(self.workers)]
+        if self.workers == 1:
+            results = [run_playouts(position_key, self.time_budget, seeds[0], self.exploration)]
+        else:
+            executor = self.get_executor()
+            futures = [
+                executor.submit(run_playouts, position_key, self.time_budget, seed, self.exploration)
+                for seed in seeds
+            ]
+            results = [future.result() for future in futures]
+
+        total_statistics: dict[int, list[float]] = {}
+        total_playouts = 0
+        for statistics, playouts in results:
+            total_playouts += playouts
+            for move, (visits, wins) in statistics.items():
+                totals = total_statistics.setdefault(move, [0, 0.0])
+                totals[0] += visits
+                totals[1] += wins
+
+        best_move = NO_MOVE
+        best_visits = 0
+        best_wins = 0.0
+        for move, (visits, wins) in total_statistics.items():
+            if visits > best_visits:
+                best_move = move
+                best_visits = visits
+                best_wins = wins
+        win_rate = best_wins / best_visits if best_visits else 0.0
+        return MctsResult(best_move, best_visits, win_rate, total_playouts, time.perf_counter() - start, self.workers)
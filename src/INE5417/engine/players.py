@@ -0,0 +1,63 @@
+import random
+from abc import ABC, abstractmethod
+
+from .alpha_beta import AlphaBetaSearch
+from .mcts import MonteCarloTreeSearch
+from ..logic.move import NO_MOVE
+from ..logic.move_generator import MAX_MOVES, generate_moves
+from ..logic.position import Position
+
+
+class EnginePlayer(ABC):
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+
+    def get_name(self) -> str:
+        return self.name
+
+    @abstractmethod
+    def choose_move(self, position: Position) -> int:
+        pass
+
+
+class RandomPlayer(EnginePlayer):
+    def __init__(self, seed: int | None = None) -> None:
+        super().__init__("random")
+        self.generator: random.Random = random.Random(seed)
+        self.moves: list[int] = [0] * MAX_MOVES
+
+    def choose_move(self, position: Position) -> int:
+        count = generate_moves(position, self.moves)
+        if count == 0:
+            return NO_MOVE
+        return self.moves[self.generator.randrange(count)]
+
+
+class AlphaBetaPlayer(EnginePlayer):
+    def __init__(self, time_budget: float) -> None:
+        super().__init__(f"alpha_beta:{time_budget:g}")
+        self.search: AlphaBetaSearch = AlphaBetaSearch(time_budget)
+
+    def choose_move(self, position: Position) -> int:
+        return self.search.search(position).get_best_move()
+
+
+class MctsPlayer(EnginePlayer):
+    def __init__(self, time_budget: float, workers: int = 1, seed: int | None = None) -> None:
+        super().__init__(f"mcts:{time_budget:g}")
+        self.search: MonteCarloTreeSearch = MonteCarloTreeSearch(time_budget, workers, seed=seed)
+
+    def choose_move(self, position: Position) -> int:
+        return self.search.search(position).get_best_move()
+
+
+def create_player(specification: str, seed: int | None = None) -> EnginePlayer:
+    # "random", "alpha_beta:<seconds per move>" or "mcts:<seconds per move>"
+    name, _, time_budget = specification.partition(":")
+    if name == "random":
+        return RandomPlayer(seed)
+    if name == "alpha_beta":
+        return AlphaBetaPlayer(float(time_budget or 0.05))
+    if name == "mcts":
+        return MctsPlayer(float(time_budget or 0.05), seed=seed)
+    raise ValueError(f"Jogador desconhecido: {specification}")
@@ -0,0 +1,74 @@
+EXACT: int = 0
+LOWER_BOUND: int = 1
+UPPER_BOUND: int = 2
+
+DEFAULT_SIZE_BITS: int = 18
+
+
+class TranspositionTable:
+    # fixed number of slots addressed by the low bits of the Zobrist key; each slot holds a tuple
+    # (zobrist_key, depth, score, bound, best_move, generation). A slot is replaced when the new entry
+    # was searched at least as deep, or when the stored one is left over from an earlier search
+    def __init__(self, size_bits: int = DEFAULT_SIZE_BITS) -> None:
+        self.size: int = 1 << size_bits
+        self.index_mask: int = self.size - 1
+        self.entries: list[tuple[int, int, int, int, int, int] | None] = [None] * self.size
+        self.generation: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.stores: int = 0
+        self.replacements: int = 0
+        self.rejections: int = 0
+
+    def get_size(self) -> int:
+        return self.size
+
+    def new_search(self) -> None:
+        self.generation += 1
+
+    def clear(self) -> None:
+        self.entries = [None] * self.size
+        self.generation = 0
+        self.reset_counters()
+
+    def reset_counters(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.replacements = 0
+        self.rejections = 0
+
+    def probe(self, zobrist_key: int) -> tuple[int, int, int, int, int, int] | None:
+        entry = self.entries[zobrist_key & self.index_mask]
+        if entry is not None and entry[0] == zobrist_key:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def store(self, zobrist_key: int, depth: int, score: int, bound: int, best_move: int) -> None:
+        index = zobrist_key & self.index_mask
+        entry = self.entries[index]
+        if entry is not None:
+            if entry[0] != zobrist_key and entry[1] > depth and entry[5] == self.generation:
+                self.rejections += 1
+                return
+            self.replacements += 1
+        self.stores += 1
+        self.entries[index] = (zobrist_key, depth, score, bound, best_move, self.generation)
+
+    def get_hit_rate(self) -> float:
+        probes = self.hits + self.misses
+        if probes == 0:
+            return 0.0
+        return self.hits / probes
+
+    def get_fill_rate(self) -> float:
+        return sum(1 for entry in self.entries if entry is not None) / self.size
+
+    def __repr__(self) -> str:
+        return (
+            f"TranspositionTable(size={self.size}, hits={self.hits}, misses={self.misses}, "
+            f"hit_rate={self.get_hit_rate():.1%}, stores={self.stores}, replacements={self.replacements}, "
+            f"rejections={self.rejections})"
+        )
@@ -0,0 +1,86 @@
+import numpy as np
+
+from .move import NO_MOVE, REMOVE
+from .position import Position
+from ..utils.constants import NUMBER_OF_TRIANGLES, NUMBER_OF_STONE_VALUES
+
+# triangles are encoded as 0 for a free triangle and 1 + stone_value + 6 * color_index otherwise;
+# the last move columns hold its stone value, position and type (-1 when there was no previous move)
+EMPTY: int = 0
+NO_PREVIOUS_MOVE: int = -1
+
+_INDICES = np.arange(NUMBER_OF_TRIANGLES)
+# RING_DISTANCES[p, i] is the distance between triangles p and i walking around the board
+RING_DISTANCES: np.ndarray = np.minimum(
+    (_INDICES[None, :] - _INDICES[:, None]) % NUMBER_OF_TRIANGLES,
+    (_INDICES[:, None] - _INDICES[None, :]) % NUMBER_OF_TRIANGLES,
+).astype(np.int8)
+UNREACHABLE: int = NUMBER_OF_TRIANGLES
+
+
+def encode_position_fields(
+    values: np.ndarray, occupancy: np.ndarray, last_moves: np.ndarray, turns: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # builds the batch arrays from the Position fields: the packed values (N,), the occupancy masks (N, 2),
+    # the packed last moves (N,) and the sides to move (N,); returns the (N, 12) triangles array and the
+    # last move value, position and type plus side to move columns
+    values = np.asarray(values, dtype=np.int64)[:, None]
+    occupancy = np.asarray(occupancy, dtype=np.int64)
+    last_moves = np.asarray(last_moves, dtype=np.int64)
+    stone_values = (values >> (3 * _INDICES)) & 0x7
+    in_first_color = ((occupancy[:, 0:1] >> _INDICES) & 1).astype(bool)
+    in_second_color = ((occupancy[:, 1:2] >> _INDICES) & 1).astype(bool)
+    triangles = np.where(
+        in_first_color, 1 + stone_values, np.where(in_second_color, 1 + NUMBER_OF_STONE_VALUES + stone_values, EMPTY)
+    ).astype(np.int8)
+    no_previous_move = last_moves == NO_MOVE
+    last_move_values = np.where(no_previous_move, 0, (last_moves >> 4) & 0x7).astype(np.int8)
+    last_move_positions = np.where(no_previous_move, 0, last_moves & 0xF).astype(np.int8)
+    last_move_types = np.where(no_previous_move, NO_PREVIOUS_MOVE, last_moves >> 7).astype(np.int8)
+    return triangles, last_move_values, last_move_positions, last_move_types, np.asarray(turns, dtype=np.int8)
+
+
+def encode_positions(positions: list[Position]) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    number_of_positions = len(positions)
+    values = np.fromiter((position.values for position in positions), np.int64, number_of_positions)
+    occupancy = np.array([position.occupancy for position in positions], dtype=np.int64).reshape(-1, 2)
+    last_moves = np.fromiter((position.last_move for position in positions), np.int64, number_of_positions)
+    turns = np.fromiter((position.turn for position in positions), np.int8, number_of_positions)
+    return encode_position_fields(values, occupancy, last_moves, turns)
+
+
+def calculate_legal_targets(
+    triangles: np.ndarray,
+    last_move_values: np.ndarray,
+    last_move_positions: np.ndarray,
+    last_move_types: np.ndarray,
+    turns: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    # vectorized calculate_range, calculate_range_inserted_old_stone and calculate_range_removed_old_stone
+    # for the side to move of every row; returns the (N, 12) legal targets mask and the (N,) flags of the
+    # rows where the side to move has no legal target, i.e. where the previous move ended the match
+    triangles = np.asarray(triangles)
+    turns = np.asarray(turns)[:, None]
+    last_move_values = np.asarray(last_move_values)[:, None]
+    last_move_types = np.asarray(last_move_types)
+    free = triangles == EMPTY
+    colors = (triangles.astype(np.int16) - 1) // NUMBER_OF_STONE_VALUES
+    own = ~free & (colors == turns)
+    opponent = ~free & (colors != turns)
+
+    distances = RING_DISTANCES[np.asarray(last_move_positions, dtype=np.intp)]
+
+    # a stone of value v reaches the triangles v steps away that do not hold an opponent stone
+    valued_targets = (distances == last_move_values) & ~opponent
+
+    # a 0 reaches the nearest free triangles after an insertion and the nearest own stones after a removal
+    allowed = np.where((last_move_types == REMOVE)[:, None], own, free) & (distances > 0)
+    allowed_distances = np.where(allowed, distances, UNREACHABLE)
+    nearest_distances = allowed_distances.min(axis=1, keepdims=True)
+    zero_targets = allowed & (allowed_distances == nearest_distances)
+
+    targets = np.where(last_move_values != 0, valued_targets, zero_targets)
+    no_previous_move = last_move_types == NO_PREVIOUS_MOVE
+    targets[no_previous_move] = free[no_previous_move]
+    terminal = ~targets.any(axis=1) & ~no_previous_move
+    return targets, terminal
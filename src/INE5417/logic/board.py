@@ -1,7 +1,28 @@
+from .move import (
+    NO_MOVE,
+    encode_move,
+    decode_move,
+    get_move_type,
+    get_move_position,
+    get_move_stone_value,
+)
+from .move_message import (
+    NO_MESSAGE,
+    IN_LEFT_BIT,
+    NEXT,
+    FINISHED,
+    get_message_move,
+    is_message_in_left,
+    get_message_match_status,
+    set_message_match_status,
+    set_message_move,
+)
 from .player import Player
+from .position import Position, FULL_OCCUPANCY
+from .reach_tables import RING_MASKS, MASK_INDICES, find_nearest
 from .stone import Stone
 from .triangle import Triangle
-from ..utils.constants import COLOR_A, COLOR_B
+from ..utils.constants import COLOR_A, COLOR_B, COLORS
 from ..utils.game_state import GameState
 from ..utils.move_type import MoveType
 
@@ -16,8 +37,11 @@ class Board:
         self.selected_stone_info: tuple[Stone, bool] | None = None
         self.border_stone_info: tuple[Stone, int] | None = None
         self.removed_stone: Stone | None = None
-        self.move_to_send: dict[str, str] = {}
+        self.move_to_send: int = NO_MESSAGE
         self.triangles: list[Triangle] = []
+        # occupied triangles of each stone color, kept in sync with the triangles for the range calculations
+        self.color_masks: dict[str, int] = {}
+        self.undo_stack: list[tuple] = []
         self.populate_triangles()
 
     def populate_triangles(self) -> None:
@@ -55,62 +79,33 @@ class Board:
     def is_local_player_winner(self) -> bool:
         return self.local_player.get_winner()
 
+    def get_triangles_in_mask(self, mask: int) -> set[Triangle]:
+        return {self.triangles[i] for i in MASK_INDICES[mask]}
+
+    def get_occupied_mask(self) -> int:
+        occupied_mask = 0
+        for color_mask in self.color_masks.values():
+            occupied_mask |= color_mask
+        return occupied_mask
+
     def calculate_range(
         self, previous_move_stone_value: int, previous_move_position: int, player_color: str
     ) -> set[Triangle]:
-        legal_positions_set = set()
-        possible_triangles = {
-            self.triangles[(previous_move_position - previous_move_stone_value) % 12],
-            self.triangles[(previous_move_position + previous_move_stone_value) % 12],
-        }
-        legal_positions_list = list(possible_triangles)
-        list_length = len(legal_positions_list)
-        for i in range(list_length):
-            triangle = legal_positions_list[i]
-            if triangle.is_free():
-                legal_positions_set.add(triangle)
-            else:
-                stone = triangle.get_stone()
-                stone_color = stone.get_color()
-                if stone_color == player_color:
-                    legal_positions_set.add(triangle)
-        return legal_positions_set
+        other_colors_mask = self.get_occupied_mask() & ~self.color_masks.get(player_color, 0)
+        legal_positions_mask = RING_MASKS[previous_move_position][previous_move_stone_value] & ~other_colors_mask
+        return self.get_triangles_in_mask(legal_positions_mask)
 
     def calculate_range_removed_old_stone(
         self, previous_move_position: int, old_stone_color: str
     ) -> set[Triangle]:
-        legal_positions = set()
-        for i in range(1, 12):
-            possible_triangles = [
-                self.triangles[(previous_move_position - i) % 12],
-                self.triangles[(previous_move_position + i) % 12]
-            ]
-            for triangle in possible_triangles:
-                if not triangle.is_free():
-                    stone = triangle.get_stone()
-                    stone_color = stone.get_color()
-                    if stone_color != old_stone_color:
-                        legal_positions.add(triangle)
-            if len(legal_positions) > 0:
-                return legal_positions
-        return legal_positions
+        other_colors_mask = self.get_occupied_mask() & ~self.color_masks.get(old_stone_color, 0)
+        return self.get_triangles_in_mask(find_nearest(previous_move_position, other_colors_mask))
 
     def calculate_range_inserted_old_stone(
         self, previous_move_position: int
     ) -> set[Triangle]:
-        legal_positions = set()
-        for i in range(1, 12):
-            possible_triangles = [
-                self.triangles[(previous_move_position - i) % 12],
-                self.triangles[(previous_move_position + i) % 12]
-            ]
-            for j in range(2):
-                triangle = possible_triangles[j]
-                if triangle.is_free():
-                    legal_positions.add(triangle)
-            if len(legal_positions) > 0:
-                return legal_positions
-        return legal_positions
+        free_mask = ~self.get_occupied_mask() & FULL_OCCUPANCY
+        return self.get_triangles_in_mask(find_nearest(previous_move_position, free_mask))
 
     def set_last_opponent_move_info(self, stone_value_involved: int, position_involved: int, move_type: MoveType) -> None:
         self.last_opponent_move_info = (stone_value_involved, position_involved, move_type)
@@ -144,36 +139,40 @@ class Board:
             return True
 
     def is_first_local_player_move(self) -> bool:
-        if self.move_to_send == {}:
+        if self.move_to_send == NO_MESSAGE:
             return True
         else:
             return False
 
     def reset_move_signature(self) -> None:
-        self.move_to_send = {}
+        self.move_to_send = NO_MESSAGE
 
-    def register_move_type_involved(self, move_type: MoveType) -> None:
-        self.move_to_send["move_type"] = move_type.name
-
-    def register_position_involved(self, position_involved: int) -> None:
-        self.move_to_send["triangle_index"] = str(position_involved)
-
-    def register_stone_value_involved(self, stone_value_involved: int) -> None:
-        self.move_to_send["stone_value"] = str(stone_value_involved)
+    # the fields of the move message (see move_message.py) are written in place; the packed move (see move.py)
+    # is written whole, so NO_MESSAGE is fully overwritten
+    def register_move_involved(self, move_type: MoveType, position_involved: int, stone_value_involved: int) -> None:
+        self.move_to_send = set_message_move(
+            self.move_to_send, encode_move(move_type, position_involved, stone_value_involved)
+        )
 
     def register_in_left(self, in_left: bool) -> None:
-        self.move_to_send["in_left"] = str(in_left)
+        if in_left:
+            self.move_to_send |= IN_LEFT_BIT
+        else:
+            self.move_to_send &= ~IN_LEFT_BIT
+
+    def register_match_status(self, match_status: int) -> None:
+        self.move_to_send = set_message_match_status(self.move_to_send, match_status)
 
     def get_last_local_player_move_type(self) -> MoveType:
-        return MoveType[self.move_to_send["move_type"]]
+        return get_move_type(get_message_move(self.move_to_send))
 
     def get_last_local_player_move_position(self) -> int:
-        return int(self.move_to_send["triangle_index"])
+        return get_move_position(get_message_move(self.move_to_send))
 
     def get_last_local_player_move_stone_value(self) -> int:
-        return int(self.move_to_send["stone_value"])
+        return get_move_stone_value(get_message_move(self.move_to_send))
 
-    def get_move_to_send(self) -> dict[str, str]:
+    def get_move_to_send(self) -> int:
         return self.move_to_send
 
     def set_is_legal_move(self, is_legal_move: bool) -> None:
@@ -185,14 +184,7 @@ class Board:
     def is_selected_position_legal(
         self, selected_position_index: int, legal_positions: set[Triangle]
     ) -> bool:
-        legal_positions_list = list(legal_positions)
-        list_length = len(legal_positions_list)
-        for i in range(list_length):
-            legal_position = legal_positions_list[i]
-            position_index = legal_position.get_index()
-            if selected_position_index == position_index:
-                return True
-        return False
+        return self.triangles[selected_position_index] in legal_positions
 
     def is_stone_of_given_color_in_selected_position(self, selected_position_index: int, color: str) -> bool:
         stone_in_triangle = self.get_stone_in_position(selected_position_index)
@@ -220,6 +212,21 @@ class Board:
         else:
             return self.calculate_range(stone_value_involved, move_position_involved, remote_player_color)
 
+    def calculate_legal_local_player_moves(self) -> set[Triangle]:
+        local_player_color = self.local_player.get_color()
+        remote_player_color = self.remote_player.get_color()
+
+        stone_value_involved = self.get_last_opponent_move_stone_value()
+        move_type_involved = self.get_last_opponent_move_type()
+        move_position_involved = self.get_last_opponent_move_position()
+        if stone_value_involved == 0:
+            if move_type_involved == MoveType.INSERT:
+                return self.calculate_range_inserted_old_stone(move_position_involved)
+            else:
+                return self.calculate_range_removed_old_stone(move_position_involved, remote_player_color)
+        else:
+            return self.calculate_range(stone_value_involved, move_position_involved, local_player_color)
+
     def there_are_legal_opponent_moves(self, legal_opponent_moves: set[Triangle]) -> bool:
         if len(legal_opponent_moves) == 0:
             return False
@@ -228,9 +235,7 @@ class Board:
 
     def perform_stone_insertion(self, selected_position_index: int, selected_stone_value: int) -> None:
         self.reset_move_signature()
-        self.register_position_involved(selected_position_index)
-        self.register_stone_value_involved(selected_stone_value)
-        self.register_move_type_involved(MoveType.INSERT)
+        self.register_move_involved(MoveType.INSERT, selected_position_index, selected_stone_value)
         is_selected_stone_in_left = self.is_selected_stone_in_left()
         self.register_in_left(is_selected_stone_in_left)
         selected_stone = self.get_selected_stone()
@@ -252,11 +257,9 @@ class Board:
     def perform_stone_remotion(self, selected_position_index: int) -> None:
         self.reset_move_signature()
         stone_in_selected_position_value = self.get_value_of_stone_in_selected_position(selected_position_index)
-        self.register_position_involved(selected_position_index)
-        self.register_stone_value_involved(stone_in_selected_position_value)
-        self.register_move_type_involved(MoveType.REMOVE)
+        self.register_move_involved(MoveType.REMOVE, selected_position_index, stone_in_selected_position_value)
         removed_stone = self.remove_stone_from_position(selected_position_index)
-        self.remote_player.insert_stone(removed_stone, False)
+        self.local_player.insert_stone(removed_stone, False)
         self.set_removed_stone(removed_stone)
         self.set_is_legal_move(True)
 
@@ -335,45 +338,49 @@ class Board:
         legal_opponent_moves = self.calculate_legal_opponent_moves()
         there_are_legal_opponent_moves = self.there_are_legal_opponent_moves(legal_opponent_moves)
         if not there_are_legal_opponent_moves:
-            self.move_to_send["match_status"] = "finished"
+            self.register_match_status(FINISHED)
             self.local_player.set_winner()
             self.set_game_state(GameState.GAME_OVER)
         else:
-            self.move_to_send["match_status"] = "next"
+            self.register_match_status(NEXT)
             self.remote_player.toggle_turn()
             self.set_game_state(GameState.REMOTE_PLAYER_TO_MOVE)
 
     def insert_stone(self, stone: Stone, selected_position_index: int) -> None:
         self.triangles[selected_position_index].insert_stone(stone)
+        stone_color = stone.get_color()
+        self.color_masks[stone_color] = self.color_masks.get(stone_color, 0) | 1 << selected_position_index
 
     def remove_stone_from_position(self, selected_position_index: int) -> Stone:
         removed_stone = self.triangles[selected_position_index].remove_stone()
+        if removed_stone is not None:
+            self.color_masks[removed_stone.get_color()] &= ~(1 << selected_position_index)
         return removed_stone
 
     def get_stone_in_position(self, position: int) -> Stone:
         return self.triangles[position].get_stone()
 
-    def get_received_move_type(self, a_move: dict[str, str]) -> MoveType:
-        return MoveType[a_move["move_type"]]
+    def get_received_move_type(self, a_move: int) -> MoveType:
+        return get_move_type(get_message_move(a_move))
 
-    def verify_if_is_game_over(self, a_move: dict[str, str]) -> bool:
-        if a_move["match_status"] == "finished":
+    def verify_if_is_game_over(self, a_move: int) -> bool:
+        if get_message_match_status(a_move) == FINISHED:
             return True
         else:
             return False
 
-    def receive_move(self, a_move: dict[str, str]) -> None:
-        received_move_type = self.get_received_move_type(a_move)
+    def receive_move(self, a_move: int) -> None:
+        received_move_type, triangle_index, stone_value = decode_move(get_message_move(a_move))
         if received_move_type == MoveType.INSERT:
-            stone = self.remote_player.get_stone(int(a_move["stone_value"]), bool(a_move["in_left"]))
+            stone = self.remote_player.get_stone(stone_value, is_message_in_left(a_move))
             self.remote_player.remove_stone(stone)
-            self.insert_stone(stone, int(a_move["triangle_index"]))
-            self.set_last_opponent_move_info(int(a_move["stone_value"]), int(a_move["triangle_index"]), MoveType.INSERT)
+            self.insert_stone(stone, triangle_index)
+            self.set_last_opponent_move_info(stone_value, triangle_index, MoveType.INSERT)
         else:
-            stone = self.remove_stone_from_position(int(a_move["triangle_index"]))
-            self.set_border_stone_info((stone, int(a_move["triangle_index"])))
+            stone = self.remove_stone_from_position(triangle_index)
+            self.set_border_stone_info((stone, triangle_index))
             self.remote_player.insert_stone(stone, False)
-            self.set_last_opponent_move_info(int(a_move["stone_value"]), int(a_move["triangle_index"]), MoveType.REMOVE)
+            self.set_last_opponent_move_info(stone_value, triangle_index, MoveType.REMOVE)
         is_game_over = self.verify_if_is_game_over(a_move)
         if is_game_over:
             self.remote_player.set_winner()
@@ -387,6 +394,7 @@ class Board:
         self.game_state = GameState.ABANDONED_BY_OTHER_PLAYER
 
     def reset_move_related_attributes(self) -> None:
+        self.undo_stack = []
         self.last_opponent_move_info = None
         self.selected_stone_info = None
         self.is_legal_move = None
@@ -396,6 +404,7 @@ class Board:
     def remove_stones_from_triangles(self) -> None:
         for i in range(12):
             self.triangles[i].reset()
+        self.color_masks = {}
 
     def verify_if_local_player_starts(self, local_player_order: str) -> bool:
         if local_player_order == "1":
@@ -428,3 +437,177 @@ class Board:
 
     def set_game_state(self, new_game_state: GameState) -> None:
         self.game_state = new_game_state
+
+    def is_local_player_to_move(self) -> bool:
+        if self.game_state == GameState.GAME_OVER:
+            return not self.local_player.get_winner()
+        return self.local_player.get_turn()
+
+    def get_last_opponent_move(self) -> int:
+        if self.last_opponent_move_info is None:
+            return NO_MOVE
+        return encode_move(
+            self.get_last_opponent_move_type(),
+            self.get_last_opponent_move_position(),
+            self.get_last_opponent_move_stone_value(),
+        )
+
+    def get_last_local_player_move(self) -> int:
+        # NO_MOVE before the first move, as NO_MESSAGE keeps only the packed move bits
+        return get_message_move(self.move_to_send)
+
+    def to_position(self) -> Position:
+        last_opponent_move = self.get_last_opponent_move()
+        last_local_player_move = self.get_last_local_player_move()
+        if self.is_local_player_to_move():
+            position = Position(
+                turn=COLORS.index(self.get_local_player_color()),
+                last_move=last_opponent_move,
+                previous_move=last_local_player_move,
+            )
+        else:
+            position = Position(
+                turn=COLORS.index(self.get_remote_player_color()),
+                last_move=last_local_player_move,
+                previous_move=last_opponent_move,
+            )
+        for i in range(12):
+            stone = self.triangles[i].get_stone()
+            if stone is not None:
+                position.put_stone(i, COLORS.index(stone.get_color()), stone.get_value())
+        return position
+
+    def get_zobrist_key(self) -> int:
+        return self.to_position().zobrist_key
+
+    def load_position(self, position: Position, local_player_color_index: int | None = None) -> None:
+        if local_player_color_index is not None:
+            self.local_player.set_color(COLORS[local_player_color_index])
+            self.remote_player.set_color(COLORS[1 - local_player_color_index])
+        self.reset_move_related_attributes()
+        self.remove_stones_from_triangles()
+        self.local_player.reset_stones()
+        self.remote_player.reset_stones()
+
+        for i in range(12):
+            color_index = position.get_color_index(i)
+            if color_index is not None:
+                if COLORS[color_index] == self.get_local_player_color():
+                    owner = self.local_player
+                else:
+                    owner = self.remote_player
+                stone = owner.get_stone(position.get_value(i), True)
+                owner.remove_stone(stone)
+                self.insert_stone(stone, i)
+
+        local_player_to_move = COLORS[position.turn] == self.get_local_player_color()
+        if local_player_to_move:
+            last_opponent_move = position.last_move
+            last_local_player_move = position.previous_move
+        else:
+            last_opponent_move = position.previous_move
+            last_local_player_move = position.last_move
+        if last_opponent_move != NO_MOVE:
+            move_type, triangle_index, stone_value = decode_move(last_opponent_move)
+            self.set_last_opponent_move_info(stone_value, triangle_index, move_type)
+        self.reset_move_signature()
+        if last_local_player_move != NO_MOVE:
+            move_type, triangle_index, stone_value = decode_move(last_local_player_move)
+            self.register_move_involved(move_type, triangle_index, stone_value)
+            self.register_in_left(True)
+            self.register_match_status(NEXT)
+
+        self.local_player.set_turn(local_player_to_move)
+        self.remote_player.set_turn(not local_player_to_move)
+        if local_player_to_move:
+            self.set_game_state(GameState.LOCAL_PLAYER_TO_MOVE)
+        else:
+            self.set_game_state(GameState.REMOTE_PLAYER_TO_MOVE)
+
+    def make_move(self, move: int) -> None:
+        # plays a legal move for the side to move, remembering just enough to take it back in unmake_move
+        move_type, triangle_index, stone_value = decode_move(move)
+        local_player_to_move = self.is_local_player_to_move()
+        if local_player_to_move:
+            player = self.local_player
+        else:
+            player = self.remote_player
+        if move_type == MoveType.INSERT:
+            stone = player.get_stone(stone_value, True)
+            player.remove_stone(stone)
+            self.insert_stone(stone, triangle_index)
+        else:
+            stone = self.remove_stone_from_position(triangle_index)
+            player.insert_stone(stone, False)
+        self.undo_stack.append((
+            move,
+            local_player_to_move,
+            stone,
+            self.last_opponent_move_info,
+            self.move_to_send,
+            self.local_player.get_turn(),
+            self.remote_player.get_turn(),
+            self.local_player.get_winner(),
+            self.remote_player.get_winner(),
+            self.game_state,
+            self.border_stone_info,
+            self.removed_stone,
+        ))
+
+        if local_player_to_move:
+            self.reset_move_signature()
+            self.register_move_involved(move_type, triangle_index, stone_value)
+            self.register_in_left(True)
+            if move_type == MoveType.REMOVE:
+                self.set_removed_stone(stone)
+            self.perform_game_over_verification()
+        else:
+            self.set_last_opponent_move_info(stone_value, triangle_index, move_type)
+            if move_type == MoveType.REMOVE:
+                self.set_border_stone_info((stone, triangle_index))
+            legal_local_player_moves = self.calculate_legal_local_player_moves()
+            there_are_legal_local_player_moves = self.there_are_legal_opponent_moves(legal_local_player_moves)
+            if not there_are_legal_local_player_moves:
+                self.remote_player.set_winner()
+                self.set_game_state(GameState.GAME_OVER)
+            else:
+                self.remote_player.toggle_turn()
+                self.local_player.toggle_turn()
+                self.set_game_state(GameState.LOCAL_PLAYER_TO_MOVE)
+
+    def unmake_move(self) -> None:
+        (
+            move,
+            local_player_to_move,
+            stone,
+            last_opponent_move_info,
+            move_to_send,
+            local_player_turn,
+            remote_player_turn,
+            local_player_winner,
+            remote_player_winner,
+            game_state,
+            border_stone_info,
+            removed_stone,
+        ) = self.undo_stack.pop()
+        move_type, triangle_index, stone_value = decode_move(move)
+        if local_player_to_move:
+            player = self.local_player
+        else:
+            player = self.remote_player
+        if move_type == MoveType.INSERT:
+            self.remove_stone_from_position(triangle_index)
+            player.insert_stone(stone, True)
+        else:
+            player.remove_stone(stone)
+            self.insert_stone(stone, triangle_index)
+
+        self.last_opponent_move_info = last_opponent_move_info
+        self.move_to_send = move_to_send
+        self.local_player.set_turn(local_player_turn)
+        self.remote_player.set_turn(remote_player_turn)
+        self.local_player.set_winner(local_player_winner)
+        self.remote_player.set_winner(remote_player_winner)
+        self.game_state = game_state
+        self.border_stone_info = border_stone_info
+        self.removed_stone = removed_stone
@@ -0,0 +1,262 @@
+import os
+import sys
+from array import array
+from collections.abc import Iterator
+from typing import BinaryIO
+
+from .move import NO_MOVE, decode_move
+from .move_generator import MAX_MOVES, generate_moves, has_legal_moves
+from .move_message import (
+    NEXT,
+    FINISHED,
+    INTERRUPTED,
+    MAX_MESSAGE,
+    get_message_move,
+    get_message_match_status,
+)
+from .position import Position
+from ..utils.game_state import GameState
+from ..utils.move_type import MoveType
+
+# a game record file starts with FILE_HEADER and holds games one after the other, each one being
+#   GAME_MARKER, a flags byte (bit 0: the recording player moved first), then for the first and the second
+#   player to move a length byte and the UTF-8 name, a length byte and the id, and then the move messages
+#   (see move_message.py), one little-endian 16-bit word each, until the next GAME_MARKER or the end of the file.
+# Move words never contain a 0xFF byte (their high byte is below 0x08 and a packed move is at most 0xDB),
+# and neither do UTF-8 text or the length bytes, which are capped, so a game starts at every 0xFF 0xFF.
+FORMAT_VERSION: int = 1
+FILE_HEADER: bytes = b"QYGR" + bytes([FORMAT_VERSION, 0, 0, 0])
+GAME_MARKER: bytes = b"\xff\xff"
+MAX_FIELD_LENGTH: int = 200
+LOCAL_PLAYER_FIRST: int = 0x1
+READ_CHUNK_SIZE: int = 1 << 20
+
+
+class InvalidGameRecord(ValueError):
+    pass
+
+
+def encode_field(text: str) -> bytes:
+    encoded = text.encode("utf-8")[:MAX_FIELD_LENGTH]
+    # drops a multi-byte character cut by the length limit
+    encoded = encoded.decode("utf-8", errors="ignore").encode("utf-8")
+    return bytes([len(encoded)]) + encoded
+
+
+def encode_game_header(players: list[list[str]], local_player_first: bool) -> bytes:
+    # players as given to Board.start_match, [name, id, order]; they are stored in move order
+    ordered_players = sorted(players, key=lambda player: player[2])
+    header = bytearray(GAME_MARKER)
+    header.append(LOCAL_PLAYER_FIRST if local_player_first else 0)
+    for name, player_id, _ in ordered_players:
+        header += encode_field(name)
+        header += encode_field(str(player_id))
+    return bytes(header)
+
+
+class GameRecord:
+    def __init__(self, players: list[list[str]], local_player_first: bool, moves: array) -> None:
+        self.players: list[list[str]] = players
+        self.local_player_first: bool = local_player_first
+        self.moves: array = moves
+
+    def get_players(self) -> list[list[str]]:
+        # [name, id, order], in move order
+        return self.players
+
+    def is_local_player_first(self) -> bool:
+        return self.local_player_first
+
+    def get_local_players_list(self) -> list[list[str]]:
+        # the players list Board.start_match got on the recording client, the local player first
+        if self.local_player_first:
+            return [self.players[0], self.players[1]]
+        return [self.players[1], self.players[0]]
+
+    def get_moves(self) -> array:
+        return self.moves
+
+    def get_number_of_moves(self) -> int:
+        return len(self.moves)
+
+    def get_match_status(self) -> int:
+        if not self.moves:
+            return NEXT
+        return get_message_match_status(self.moves[-1])
+
+    def to_bytes(self) -> bytes:
+        # a word above MAX_MESSAGE or holding NO_MOVE could contain GAME_MARKER and break the file's framing
+        for index, message in enumerate(self.moves):
+            if message > MAX_MESSAGE or get_message_move(message) == NO_MOVE:
+                raise InvalidGameRecord(f"jogada {index}: palavra {message} não é uma jogada")
+        header = encode_game_header(self.players, self.local_player_first)
+        moves = array("H", self.moves)
+        if sys.byteorder != "little":
+            moves.byteswap()
+        return header + moves.tobytes()
+
+
+def parse_game(data: bytes, start: int, end: int) -> GameRecord:
+    # the game between the GAME_MARKER at start and end
+    if data[start:start + 2] != GAME_MARKER:
+        raise InvalidGameRecord(f"marcador de partida ausente na posição {start}")
+    try:
+        index = start + 2
+        flags = data[index]
+        index += 1
+        players = []
+        for order in ("1", "2"):
+            fields = []
+            for _ in range(2):
+                length = data[index]
+                fields.append(data[index + 1:index + 1 + length].decode("utf-8"))
+                index += 1 + length
+            players.append([fields[0], fields[1], order])
+    except (IndexError, UnicodeDecodeError) as error:
+        raise InvalidGameRecord(f"cabeçalho de partida inválido na posição {start}") from error
+    if index > end:
+        raise InvalidGameRecord(f"cabeçalho de partida inválido na posição {start}")
+    moves = array("H")
+    # a trailing odd byte is a move cut by an interrupted write
+    moves.frombytes(data[index:end - (end - index) % 2])
+    if sys.byteorder != "little":
+        moves.byteswap()
+    return GameRecord(players, bool(flags & LOCAL_PLAYER_FIRST), moves)
+
+
+def read_games(path: str | os.PathLike, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[GameRecord]:
+    # lazily yields the games of a record file, keeping at most one chunk plus one game in memory
+    with open(path, "rb") as record_file:
+        if record_file.read(len(FILE_HEADER)) != FILE_HEADER:
+            raise InvalidGameRecord(f"{path} não é um arquivo de partidas na versão {FORMAT_VERSION}")
+        buffer = b""
+        while True:
+            chunk = record_file.read(chunk_size)
+            buffer = buffer + chunk if buffer else chunk
+            start = 0
+            while True:
+                end = buffer.find(GAME_MARKER, start + 2)
+                if end == -1:
+                    break
+                yield parse_game(buffer, start, end)
+                start = end
+            buffer = buffer[start:]
+            if not chunk:
+                if buffer:
+                    yield parse_game(buffer, 0, len(buffer))
+                return
+
+
+class GameRecordWriter:
+    # append-only writer: games are streamed move by move, so a record survives a crash up to its last move
+    def __init__(self, path: str | os.PathLike) -> None:
+        self.path = path
+        self.file: BinaryIO = open(path, "ab")
+        if self.file.tell() == 0:
+            self.file.write(FILE_HEADER)
+        elif not self.has_file_header():
+            self.file.close()
+            raise InvalidGameRecord(f"{path} não é um arquivo de partidas na versão {FORMAT_VERSION}")
+        self.games_written: int = 0
+        self.in_game: bool = False
+
+    def has_file_header(self) -> bool:
+        with open(self.path, "rb") as record_file:
+            return record_file.read(len(FILE_HEADER)) == FILE_HEADER
+
+    def get_games_written(self) -> int:
+        return self.games_written
+
+    def start_game(self, players: list[list[str]], local_player_first: bool) -> None:
+        self.file.write(encode_game_header(players, local_player_first))
+        self.games_written += 1
+        self.in_game = True
+
+    def record_move(self, message: int) -> None:
+        if not self.in_game:
+            return
+        self.file.write(message.to_bytes(2, "little"))
+        if get_message_match_status(message) != NEXT:
+            self.end_game()
+
+    def end_game(self) -> None:
+        self.in_game = False
+        self.file.flush()
+
+    def write_game(self, record: GameRecord) -> None:
+        # bulk export, without flushing after each game
+        self.file.write(record.to_bytes())
+        self.games_written += 1
+
+    def close(self) -> None:
+        self.in_game = False
+        self.file.close()
+
+    def __enter__(self) -> "GameRecordWriter":
+        return self
+
+    def __exit__(self, *exception_info) -> None:
+        self.close()
+
+
+def replay_positions(record: GameRecord) -> Iterator[Position]:
+    # the position after each move (one Position, updated in place), checking every move and match status
+    # against the rules; raises InvalidGameRecord at the first inconsistency
+    position = Position()
+    moves = [0] * MAX_MOVES
+    finished = False
+    for ply, message in enumerate(record.get_moves()):
+        if finished:
+            raise InvalidGameRecord(f"jogada {ply} após o fim da partida")
+        if message > MAX_MESSAGE:
+            raise InvalidGameRecord(f"jogada {ply} inválida: {message}")
+        move = get_message_move(message)
+        count = generate_moves(position, moves)
+        if move == NO_MOVE or move not in moves[:count]:
+            raise InvalidGameRecord(f"jogada {ply} ilegal: {decode_move(move)}")
+        position.make_move(move)
+        match_status = get_message_match_status(message)
+        if match_status == INTERRUPTED:
+            raise InvalidGameRecord(f"jogada {ply} com estado de partida inválido")
+        # the Board ends a match when the opponent has no target triangle, so a match may also stop
+        # with NEXT, the opponent holding no stone for the targets, but never end with legal moves left
+        if match_status == FINISHED and has_legal_moves(position):
+            raise InvalidGameRecord(f"jogada {ply} com estado de partida incorreto")
+        finished = match_status == FINISHED
+        yield position
+
+
+def validate_game(record: GameRecord) -> int:
+    # number of moves of a valid game, InvalidGameRecord otherwise
+    plies = 0
+    for _ in replay_positions(record):
+        plies += 1
+    return plies
+
+
+def replay_on_board(record: GameRecord):
+    # replays the game on a Board from the recording player's side, through the same calls as the GUI;
+    # slower than replay_positions, but checks the Board rules themselves
+    from .board import Board
+
+    board = Board()
+    board.start_match(record.get_local_players_list())
+    local_to_move = record.is_local_player_first()
+    board.set_game_state(GameState.LOCAL_PLAYER_TO_MOVE if local_to_move else GameState.REMOTE_PLAYER_TO_MOVE)
+    for ply, message in enumerate(record.get_moves()):
+        if board.get_game_state() == GameState.GAME_OVER:
+            raise InvalidGameRecord(f"jogada {ply} após o fim da partida")
+        if board.get_game_state() == GameState.LOCAL_PLAYER_TO_MOVE:
+            move_type, triangle_index, stone_value = decode_move(get_message_move(message))
+            if move_type == MoveType.INSERT:
+                board.stone_selected(stone_value, True)
+            board.position_selected(triangle_index)
+            if not board.get_is_legal_move():
+                raise InvalidGameRecord(f"jogada {ply} ilegal: {decode_move(get_message_move(message))}")
+            board.perform_game_over_verification()
+            expected_status = get_message_match_status(board.get_move_to_send())
+            if get_message_match_status(message) != expected_status:
+                raise InvalidGameRecord(f"jogada {ply} com estado de partida incorreto")
+        else:
+            board.receive_move(message)
+    return board
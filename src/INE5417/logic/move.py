@@ -0,0 +1,33 @@
+from ..utils.move_type import MoveType
+
+# a move is packed in a single byte: bits 0-3 hold the triangle index, bits 4-6 the stone value
+# and bit 7 the move type (0 - insert; 1 - remove)
+NO_MOVE: int = 0xFF
+INSERT: int = MoveType.INSERT.value
+REMOVE: int = MoveType.REMOVE.value
+
+MOVE_TYPES = (MoveType.INSERT, MoveType.REMOVE)
+
+
+def encode_move(move_type: MoveType, triangle_index: int, stone_value: int) -> int:
+    return (move_type.value << 7) | (stone_value << 4) | triangle_index
+
+
+def get_move_type(move: int) -> MoveType:
+    return MOVE_TYPES[move >> 7]
+
+
+def get_move_position(move: int) -> int:
+    return move & 0xF
+
+
+def get_move_stone_value(move: int) -> int:
+    return (move >> 4) & 0x7
+
+
+def is_removal(move: int) -> bool:
+    return move >> 7 == REMOVE
+
+
+def decode_move(move: int) -> tuple[MoveType, int, int]:
+    return MOVE_TYPES[move >> 7], move & 0xF, (move >> 4) & 0x7
@@ -0,0 +1,90 @@
+from collections.abc import Iterator
+
+from .move import NO_MOVE, REMOVE, decode_move
+from .position import Position, FULL_OCCUPANCY, VALUE_BITS, VALUE_MASK
+from .reach_tables import RING_MASKS, MASK_INDICES, find_nearest
+from ..utils.constants import NUMBER_OF_TRIANGLES, NUMBER_OF_STONE_VALUES
+from ..utils.move_type import MoveType
+
+# the first move of a match may insert any stone value in any triangle
+MAX_MOVES: int = NUMBER_OF_TRIANGLES * NUMBER_OF_STONE_VALUES
+
+MAX_STONES_WITH_VALUE_ON_BOARD: int = 2
+STONES_WITH_VALUE_PER_PLAYER: int = 2
+
+
+def calculate_targets(position: Position) -> int:
+    last_move = position.last_move
+    own = position.occupancy[position.turn]
+    opponent = position.occupancy[position.turn ^ 1]
+    free = ~(own | opponent) & FULL_OCCUPANCY
+    if last_move == NO_MOVE:
+        return free
+    previous_move_position = last_move & 0xF
+    previous_move_stone_value = (last_move >> 4) & 0x7
+    if previous_move_stone_value != 0:
+        return RING_MASKS[previous_move_position][previous_move_stone_value] & ~opponent
+    if last_move >> 7 == REMOVE:
+        return find_nearest(previous_move_position, own)
+    return find_nearest(previous_move_position, free)
+
+
+def calculate_insertable_values(position: Position) -> list[int]:
+    on_board = [0] * NUMBER_OF_STONE_VALUES
+    own_on_board = [0] * NUMBER_OF_STONE_VALUES
+    own = position.occupancy[position.turn]
+    values = position.values
+    for index in MASK_INDICES[own | position.occupancy[position.turn ^ 1]]:
+        value = (values >> (VALUE_BITS * index)) & VALUE_MASK
+        on_board[value] += 1
+        if (own >> index) & 1:
+            own_on_board[value] += 1
+    return [
+        value
+        for value in range(NUMBER_OF_STONE_VALUES)
+        if on_board[value] < MAX_STONES_WITH_VALUE_ON_BOARD
+        and own_on_board[value] < STONES_WITH_VALUE_PER_PLAYER
+    ]
+
+
+def generate_moves(position: Position, moves: list[int]) -> int:
+    # writes the packed legal moves of the side to move into moves (of length at least MAX_MOVES)
+    # and returns how many were written
+    targets = calculate_targets(position)
+    if not targets:
+        return 0
+    count = 0
+    own = position.occupancy[position.turn]
+    values = position.values
+
+    for index in MASK_INDICES[targets & own]:
+        moves[count] = 0x80 | (((values >> (VALUE_BITS * index)) & VALUE_MASK) << 4) | index
+        count += 1
+
+    insertions = targets & ~(own | position.occupancy[position.turn ^ 1])
+    if insertions:
+        insertable_values = calculate_insertable_values(position)
+        # the stone just removed by the side to move can not be inserted back in the same triangle
+        previous_move = position.previous_move
+        if previous_move != NO_MOVE and previous_move >> 7 == REMOVE:
+            forbidden_move = previous_move & 0x7F
+        else:
+            forbidden_move = NO_MOVE
+        for index in MASK_INDICES[insertions]:
+            for value in insertable_values:
+                move = (value << 4) | index
+                if move != forbidden_move:
+                    moves[count] = move
+                    count += 1
+    return count
+
+
+def has_legal_moves(position: Position) -> bool:
+    return generate_moves(position, [0] * MAX_MOVES) > 0
+
+
+def legal_moves(position: Position) -> Iterator[tuple[MoveType, int, int]]:
+    moves = [0] * MAX_MOVES
+    count = generate_moves(position, moves)
+    for i in range(count):
+        yield decode_move(moves[i])
@@ -0,0 +1,106 @@
+import json
+import re
+
+from .move import NO_MOVE, encode_move
+from ..utils.constants import NUMBER_OF_TRIANGLES, NUMBER_OF_STONE_VALUES
+from ..utils.move_type import MoveType
+
+# a move message is the packed move of move.py (bits 0-7) plus what the other client needs to replay it:
+# bit 8 tells whether the inserted stone was the left one of its pair and bits 9-10 hold the match status
+MOVE_MESSAGE_VERSION: str = "1"
+NO_MESSAGE: int = NO_MOVE
+MOVE_MASK: int = 0xFF
+IN_LEFT_BIT: int = 1 << 8
+MATCH_STATUS_SHIFT: int = 9
+MATCH_STATUS_MASK: int = 0x3 << MATCH_STATUS_SHIFT
+MAX_MESSAGE: int = (1 << 11) - 1
+
+# match status codes, in the order of their names in the DOG protocol
+NEXT: int = 0
+FINISHED: int = 1
+INTERRUPTED: int = 2
+MATCH_STATUSES: tuple[str, ...] = ("next", "finished", "interrupted")
+
+# the DOG server answers with str() of the stored dictionary, whose keys and values are all plain strings
+_ENTRY = r"'([A-Za-z_][A-Za-z0-9_]*)': '([A-Za-z0-9_.-]*)'"
+_ENTRY_PATTERN = re.compile(_ENTRY)
+_DICTIONARY_PATTERN = re.compile(r"\{(?:%s(?:, %s)*)?\}" % (_ENTRY, _ENTRY))
+
+
+def encode_move_message(move: int, in_left: bool, match_status: int) -> int:
+    return move | (IN_LEFT_BIT if in_left else 0) | (match_status << MATCH_STATUS_SHIFT)
+
+
+def get_message_move(message: int) -> int:
+    return message & MOVE_MASK
+
+
+def set_message_move(message: int, move: int) -> int:
+    return (message & ~MOVE_MASK) | move
+
+
+def is_message_in_left(message: int) -> bool:
+    return bool(message & IN_LEFT_BIT)
+
+
+def get_message_match_status(message: int) -> int:
+    return (message & MATCH_STATUS_MASK) >> MATCH_STATUS_SHIFT
+
+
+def set_message_match_status(message: int, match_status: int) -> int:
+    return (message & ~MATCH_STATUS_MASK) | (match_status << MATCH_STATUS_SHIFT)
+
+
+def to_wire(message: int) -> dict[str, str]:
+    # match_status also goes in clear, as the DOG server reads it to end the match
+    return {
+        "v": MOVE_MESSAGE_VERSION,
+        "m": str(message),
+        "match_status": MATCH_STATUSES[get_message_match_status(message)],
+    }
+
+
+def from_wire(fields: dict[str, str]) -> int:
+    # strict decoder of a received move, ValueError when it is not a valid message
+    version = fields.get("v")
+    if version is None:
+        return from_legacy_wire(fields)
+    if version != MOVE_MESSAGE_VERSION:
+        raise ValueError(f"versão de jogada desconhecida: {version}")
+    encoded = fields.get("m")
+    if encoded is None or not encoded.isdigit():
+        raise ValueError(f"jogada inválida: {encoded}")
+    message = int(encoded)
+    if message > MAX_MESSAGE or message & MOVE_MASK == NO_MOVE or get_message_match_status(message) > INTERRUPTED:
+        raise ValueError(f"jogada inválida: {encoded}")
+    if message & 0xF >= NUMBER_OF_TRIANGLES or (message >> 4) & 0x7 >= NUMBER_OF_STONE_VALUES:
+        raise ValueError(f"jogada fora do tabuleiro: {encoded}")
+    return message
+
+
+def from_legacy_wire(fields: dict[str, str]) -> int:
+    # the dictionary of strings sent by clients older than the versioned format
+    try:
+        move_type = MoveType[fields["move_type"]]
+        triangle_index = int(fields["triangle_index"])
+        stone_value = int(fields["stone_value"])
+        match_status = MATCH_STATUSES.index(fields["match_status"])
+    except KeyError as error:
+        raise ValueError(f"jogada inválida: {fields}") from error
+    if not 0 <= triangle_index < NUMBER_OF_TRIANGLES or not 0 <= stone_value < NUMBER_OF_STONE_VALUES:
+        raise ValueError(f"jogada inválida: {fields}")
+    move = encode_move(move_type, triangle_index, stone_value)
+    return encode_move_message(move, fields.get("in_left") == "True", match_status)
+
+
+def parse_server_dictionary(text: str) -> dict[str, str]:
+    # replaces eval() on the dictionaries returned by the DOG server: only str() of a dictionary of plain
+    # strings, or its JSON equivalent, is accepted
+    if _DICTIONARY_PATTERN.fullmatch(text):
+        return dict(_ENTRY_PATTERN.findall(text))
+    fields = json.loads(text)
+    if not isinstance(fields, dict) or not all(
+        isinstance(key, str) and isinstance(value, str) for key, value in fields.items()
+    ):
+        raise ValueError(f"dicionário inválido: {text}")
+    return fields
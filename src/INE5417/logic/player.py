@@ -20,6 +20,13 @@ class Player:
         self.stones = []
         self.populate_stone_list()
 
+    def reset_stones(self) -> None:
+        self.stones = []
+        self.populate_stone_list()
+        for i in range(6):
+            for j in range(2):
+                self.stones[i][j].update(self.color)
+
     def populate_stone_list(self) -> None:
         for i in range(6):
             left_stone = Stone(i)
@@ -45,18 +52,24 @@ class Player:
     def get_color(self) -> str:
         return self.color
 
+    def set_turn(self, turn: bool) -> None:
+        self.turn = turn
+
     def get_turn(self) -> bool:
         return self.turn
 
     def get_winner(self) -> bool:
         return self.winner
 
-    def set_winner(self) -> None:
-        self.winner = True
+    def set_winner(self, winner: bool = True) -> None:
+        self.winner = winner
 
     def get_stone(self, value: int, in_left: bool) -> Stone:
         return self.stones[value][in_left - 1]
 
+    def has_stone_with_value(self, value: int) -> bool:
+        return len(self.stones[value]) > 0
+
     def insert_stone(self, stone: Stone, in_left: bool) -> None:
         selected_stone_value = stone.get_value()
         self.stones[selected_stone_value].insert(in_left - 1, stone)
@@ -0,0 +1,184 @@
+from .move import NO_MOVE, REMOVE
+from .zobrist import STONE_KEYS, TURN_KEY, LAST_MOVE_KEYS, PREVIOUS_MOVE_KEYS, get_moves_key, get_stone_key
+from ..utils.constants import COLORS, NUMBER_OF_TRIANGLES
+
+FULL_OCCUPANCY: int = (1 << NUMBER_OF_TRIANGLES) - 1
+VALUE_BITS: int = 3
+VALUE_MASK: int = 0b111
+
+
+class Position:
+    # compact game state: one 12-bit occupancy mask per color (indexed as in COLORS), the stone values
+    # packed 3 bits per triangle, the color index of the side to move, the last move played (by the
+    # opponent of the side to move) and the previous move of the side to move, both packed as in move.py;
+    # the Zobrist key of all of it is kept up to date by every mutation
+    __slots__ = ("occupancy", "values", "turn", "last_move", "previous_move", "zobrist_key")
+
+    def __init__(
+        self,
+        occupancy: list[int] | None = None,
+        values: int = 0,
+        turn: int = 0,
+        last_move: int = NO_MOVE,
+        previous_move: int = NO_MOVE,
+        zobrist_key: int | None = None,
+    ) -> None:
+        if occupancy is None:
+            occupancy = [0, 0]
+        self.occupancy: list[int] = occupancy
+        self.values: int = values
+        self.turn: int = turn
+        self.last_move: int = last_move
+        self.previous_move: int = previous_move
+        if zobrist_key is None:
+            zobrist_key = self.compute_zobrist_key()
+        self.zobrist_key: int = zobrist_key
+
+    def copy(self) -> "Position":
+        return Position(
+            [self.occupancy[0], self.occupancy[1]],
+            self.values,
+            self.turn,
+            self.last_move,
+            self.previous_move,
+            self.zobrist_key,
+        )
+
+    def compute_zobrist_key(self) -> int:
+        # from scratch, when a position is built; moves update the key incrementally below
+        zobrist_key = get_moves_key(self.last_move, self.previous_move)
+        if self.turn:
+            zobrist_key ^= TURN_KEY
+        for color_index in range(2):
+            mask = self.occupancy[color_index]
+            while mask:
+                lowest_bit = mask & -mask
+                index = lowest_bit.bit_length() - 1
+                zobrist_key ^= get_stone_key(index, color_index, self.get_value(index))
+                mask ^= lowest_bit
+        return zobrist_key
+
+    def key(self) -> int:
+        return (
+            self.values
+            | self.occupancy[0] << 36
+            | self.occupancy[1] << 48
+            | self.last_move << 60
+            | self.previous_move << 68
+            | self.turn << 76
+        )
+
+    @classmethod
+    def from_key(cls, key: int) -> "Position":
+        return cls(
+            [(key >> 36) & FULL_OCCUPANCY, (key >> 48) & FULL_OCCUPANCY],
+            key & ((1 << 36) - 1),
+            key >> 76,
+            (key >> 60) & 0xFF,
+            (key >> 68) & 0xFF,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Position):
+            return NotImplemented
+        return self.key() == other.key()
+
+    def __hash__(self) -> int:
+        return self.zobrist_key
+
+    def __repr__(self) -> str:
+        cells = []
+        for i in range(NUMBER_OF_TRIANGLES):
+            color_index = self.get_color_index(i)
+            if color_index is None:
+                cells.append(".")
+            else:
+                cells.append(COLORS[color_index][0] + str(self.get_value(i)))
+        return f"Position({' '.join(cells)}; turn={COLORS[self.turn]})"
+
+    def get_occupied_mask(self) -> int:
+        return self.occupancy[0] | self.occupancy[1]
+
+    def get_free_mask(self) -> int:
+        return ~(self.occupancy[0] | self.occupancy[1]) & FULL_OCCUPANCY
+
+    def is_free(self, index: int) -> bool:
+        return not ((self.occupancy[0] | self.occupancy[1]) >> index) & 1
+
+    def get_color_index(self, index: int) -> int | None:
+        if (self.occupancy[0] >> index) & 1:
+            return 0
+        if (self.occupancy[1] >> index) & 1:
+            return 1
+        return None
+
+    def get_value(self, index: int) -> int:
+        return (self.values >> (VALUE_BITS * index)) & VALUE_MASK
+
+    def is_color_in_position(self, index: int, color_index: int) -> bool:
+        return bool((self.occupancy[color_index] >> index) & 1)
+
+    def put_stone(self, index: int, color_index: int, value: int) -> None:
+        self.occupancy[color_index] |= 1 << index
+        self.values |= value << (VALUE_BITS * index)
+        self.zobrist_key ^= STONE_KEYS[(index << 4) | (color_index << 3) | value]
+
+    def take_stone(self, index: int) -> int:
+        shift = VALUE_BITS * index
+        value = (self.values >> shift) & VALUE_MASK
+        color_index = (self.occupancy[1] >> index) & 1
+        self.values &= ~(VALUE_MASK << shift)
+        self.occupancy[color_index] &= ~(1 << index)
+        self.zobrist_key ^= STONE_KEYS[(index << 4) | (color_index << 3) | value]
+        return value
+
+    def count_stones_with_value(self, value: int, color_index: int | None = None) -> int:
+        if color_index is None:
+            mask = self.occupancy[0] | self.occupancy[1]
+        else:
+            mask = self.occupancy[color_index]
+        counter = 0
+        values = self.values
+        while mask:
+            lowest_bit = mask & -mask
+            index = lowest_bit.bit_length() - 1
+            if (values >> (VALUE_BITS * index)) & VALUE_MASK == value:
+                counter += 1
+            mask ^= lowest_bit
+        return counter
+
+    def make_move(self, move: int) -> int:
+        index = move & 0xF
+        if move >> 7 == REMOVE:
+            self.take_stone(index)
+        else:
+            self.put_stone(index, self.turn, (move >> 4) & 0x7)
+        undo = self.previous_move
+        self.zobrist_key ^= (
+            TURN_KEY
+            ^ PREVIOUS_MOVE_KEYS[undo]
+            ^ LAST_MOVE_KEYS[self.last_move]
+            ^ PREVIOUS_MOVE_KEYS[self.last_move]
+            ^ LAST_MOVE_KEYS[move]
+        )
+        self.previous_move = self.last_move
+        self.last_move = move
+        self.turn ^= 1
+        return undo
+
+    def unmake_move(self, move: int, undo: int) -> None:
+        self.zobrist_key ^= (
+            TURN_KEY
+            ^ LAST_MOVE_KEYS[move]
+            ^ PREVIOUS_MOVE_KEYS[self.previous_move]
+            ^ LAST_MOVE_KEYS[self.previous_move]
+            ^ PREVIOUS_MOVE_KEYS[undo]
+        )
+        self.turn ^= 1
+        self.last_move = self.previous_move
+        self.previous_move = undo
+        index = move & 0xF
+        if move >> 7 == REMOVE:
+            self.put_stone(index, self.turn, (move >> 4) & 0x7)
+        else:
+            self.take_stone(index)
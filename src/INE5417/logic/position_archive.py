@@ -0,0 +1,211 @@
+import mmap
+import os
+import struct
+import sys
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+
+from .game_record import GameRecord, InvalidGameRecord, replay_positions
+from .position import Position, VALUE_BITS, VALUE_MASK
+from ..utils.constants import COLORS, NUMBER_OF_TRIANGLES
+
+# an archive file is ARCHIVE_HEADER, the position records and the index:
+#   - each record is RECORD: the Zobrist key, the first 64 bits of Position.key(), then its upper bits, the ply
+#     (moves played to reach the position) and the game (its order in the game record file it came from);
+#     the 24 bytes are read as three little-endian 64-bit words, the second one holding the stones (the values
+#     in bits 0-35 and the occupancy of each color in bits 36-47 and 48-59), so queries on the stones need
+#     a single mask and comparison per record
+#   - the index is the Zobrist keys of all records, sorted, followed by the matching record numbers
+ARCHIVE_MAGIC: bytes = b"QYPA"
+ARCHIVE_VERSION: int = 1
+ARCHIVE_HEADER: struct.Struct = struct.Struct("<4sII4xQQ")  # magic, version, record size, records, index offset
+RECORD: struct.Struct = struct.Struct("<QQHHI")
+RECORD_WORDS: int = RECORD.size // 8
+KEY_LOW_BITS: int = 64
+KEY_LOW_MASK: int = (1 << KEY_LOW_BITS) - 1
+OCCUPANCY_SHIFT: int = 36
+
+
+class InvalidPositionArchive(ValueError):
+    pass
+
+
+def stone_pattern(triangle_index: int, color_index: int, stone_value: int) -> tuple[int, int]:
+    # mask and expected stone bits of "triangle_index holds a stone_value stone of color_index"
+    value_shift = VALUE_BITS * triangle_index
+    mask = (
+        VALUE_MASK << value_shift
+        | 1 << (OCCUPANCY_SHIFT + triangle_index)
+        | 1 << (OCCUPANCY_SHIFT + NUMBER_OF_TRIANGLES + triangle_index)
+    )
+    expected = stone_value << value_shift | 1 << (OCCUPANCY_SHIFT + NUMBER_OF_TRIANGLES * color_index + triangle_index)
+    return mask, expected
+
+
+def empty_triangle_pattern(triangle_index: int) -> tuple[int, int]:
+    mask = 1 << (OCCUPANCY_SHIFT + triangle_index) | 1 << (OCCUPANCY_SHIFT + NUMBER_OF_TRIANGLES + triangle_index)
+    return mask, 0
+
+
+def combine_patterns(patterns: Iterable[tuple[int, int]]) -> tuple[int, int]:
+    # all the patterns at once; contradicting patterns on the same triangle never match
+    mask = 0
+    expected = 0
+    for pattern_mask, pattern_expected in patterns:
+        if (expected ^ pattern_expected) & mask & pattern_mask:
+            return 0, 1
+        mask |= pattern_mask
+        expected |= pattern_expected
+    return mask, expected
+
+
+class PositionArchiveWriter:
+    # writes the records as they come and the index on close; archives are built once and then only read
+    def __init__(self, path: str | os.PathLike) -> None:
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(bytes(ARCHIVE_HEADER.size))
+        # Zobrist key << 32 | record number, sorted into the index on close
+        self.index_entries: list[int] = []
+        self.games: int = 0
+        self.invalid_games: int = 0
+
+    def get_number_of_positions(self) -> int:
+        return len(self.index_entries)
+
+    def get_number_of_games(self) -> int:
+        return self.games
+
+    def get_number_of_invalid_games(self) -> int:
+        return self.invalid_games
+
+    def add_position(self, position: Position, game: int, ply: int) -> None:
+        key = position.key()
+        self.file.write(RECORD.pack(position.zobrist_key, key & KEY_LOW_MASK, key >> KEY_LOW_BITS, ply, game))
+        self.index_entries.append(position.zobrist_key << 32 | len(self.index_entries))
+
+    def add_game(self, record: GameRecord) -> None:
+        # the positions after each move; a game breaking the rules is left out from its first invalid move on
+        game = self.games
+        self.games += 1
+        try:
+            for ply, position in enumerate(replay_positions(record), 1):
+                self.add_position(position, game, ply)
+        except InvalidGameRecord:
+            self.invalid_games += 1
+
+    def close(self) -> None:
+        self.index_entries.sort()
+        index_offset = self.file.tell()
+        zobrist_keys = bytearray()
+        record_numbers = bytearray()
+        for entry in self.index_entries:
+            zobrist_keys += (entry >> 32).to_bytes(8, "little")
+            record_numbers += (entry & 0xFFFFFFFF).to_bytes(4, "little")
+        self.file.write(zobrist_keys)
+        self.file.write(record_numbers)
+        self.file.seek(0)
+        self.file.write(
+            ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, RECORD.size, len(self.index_entries), index_offset)
+        )
+        self.file.close()
+
+    def __enter__(self) -> "PositionArchiveWriter":
+        return self
+
+    def __exit__(self, *exception_info) -> None:
+        self.close()
+
+
+def build_archive(records: Iterable[GameRecord], path: str | os.PathLike) -> PositionArchiveWriter:
+    with PositionArchiveWriter(path) as writer:
+        for record in records:
+            writer.add_game(record)
+    return writer
+
+
+class PositionArchive:
+    # read-only view of an archive file: opening maps it without reading the records, and queries look
+    # at the mapped words directly, creating Position objects only for the matches asked for
+    def __init__(self, path: str | os.PathLike) -> None:
+        self.path = path
+        if sys.byteorder != "little":
+            # the mapped words are read in the machine's byte order
+            raise InvalidPositionArchive("arquivos de posições só são lidos em máquinas little-endian")
+        with open(path, "rb") as archive_file:
+            if os.fstat(archive_file.fileno()).st_size < ARCHIVE_HEADER.size:
+                raise InvalidPositionArchive(f"{path} não é um arquivo de posições")
+            self.map: mmap.mmap = mmap.mmap(archive_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, records, index_offset = ARCHIVE_HEADER.unpack_from(self.map)
+        if magic != ARCHIVE_MAGIC or version != ARCHIVE_VERSION or record_size != RECORD.size:
+            self.map.close()
+            raise InvalidPositionArchive(f"{path} não é um arquivo de posições na versão {ARCHIVE_VERSION}")
+        if index_offset + records * 12 > len(self.map):
+            self.map.close()
+            raise InvalidPositionArchive(f"{path} está incompleto")
+        self.records: int = records
+        view = memoryview(self.map)
+        self.words: memoryview = view[ARCHIVE_HEADER.size:index_offset].cast("Q")
+        self.index_keys: memoryview = view[index_offset:index_offset + 8 * records].cast("Q")
+        self.index_records: memoryview = view[index_offset + 8 * records:index_offset + 12 * records].cast("I")
+        view.release()
+
+    def __len__(self) -> int:
+        return self.records
+
+    def get_zobrist_key(self, record: int) -> int:
+        return self.words[RECORD_WORDS * record]
+
+    def get_position(self, record: int) -> Position:
+        _, key_low, key_high, _, _ = RECORD.unpack_from(self.map, ARCHIVE_HEADER.size + RECORD.size * record)
+        return Position.from_key(key_high << KEY_LOW_BITS | key_low)
+
+    def get_game(self, record: int) -> int:
+        return self.words[RECORD_WORDS * record + 2] >> 32
+
+    def get_ply(self, record: int) -> int:
+        return (self.words[RECORD_WORDS * record + 2] >> 16) & 0xFFFF
+
+    def find_zobrist_key(self, zobrist_key: int) -> list[int]:
+        # record numbers, in archive order, of the positions with that Zobrist key
+        start = bisect_left(self.index_keys, zobrist_key)
+        end = bisect_right(self.index_keys, zobrist_key, start)
+        return sorted(self.index_records[start:end])
+
+    def find_position(self, position: Position) -> list[int]:
+        # as find_zobrist_key, without the records of other positions sharing the key
+        key = position.key()
+        return [
+            record for record in self.find_zobrist_key(position.zobrist_key)
+            if self.words[RECORD_WORDS * record + 1] == key & KEY_LOW_MASK
+            and self.words[RECORD_WORDS * record + 2] & 0xFFFF == key >> KEY_LOW_BITS
+        ]
+
+    def find_games(self, zobrist_key: int) -> list[int]:
+        # the games reaching positions with that Zobrist key
+        return sorted({self.get_game(record) for record in self.find_zobrist_key(zobrist_key)})
+
+    def find_matching(self, mask: int, expected: int) -> list[int]:
+        # record numbers of the positions whose stone bits (see stone_pattern) match, in archive order; a list,
+        # so that no view of the map outlives the call and the archive can be closed at any time
+        with self.words[1::RECORD_WORDS] as stones:
+            return [record for record, stone_bits in enumerate(stones) if stone_bits & mask == expected]
+
+    def count_matching(self, mask: int, expected: int) -> int:
+        with self.words[1::RECORD_WORDS] as stones:
+            return sum(1 for stone_bits in stones if stone_bits & mask == expected)
+
+    def find_stone(self, triangle_index: int, color: str, stone_value: int) -> list[int]:
+        return self.find_matching(*stone_pattern(triangle_index, COLORS.index(color), stone_value))
+
+    def close(self) -> None:
+        self.words.release()
+        self.index_keys.release()
+        self.index_records.release()
+        self.map.close()
+
+    def __enter__(self) -> "PositionArchive":
+        return self
+
+    def __exit__(self, *exception_info) -> None:
+        self.close()
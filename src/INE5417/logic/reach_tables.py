@@ -0,0 +1,34 @@
+from ..utils.constants import NUMBER_OF_TRIANGLES
+
+# distances around the ring of triangles go from 1 to 6, further steps reach the same triangles again
+MAX_RING_DISTANCE: int = NUMBER_OF_TRIANGLES // 2
+
+# RING_MASKS[p][d] is the mask of the triangles d steps away from triangle p, in either direction;
+# a stone of value v played in p reaches RING_MASKS[p][v]
+RING_MASKS: tuple[tuple[int, ...], ...] = tuple(
+    tuple(
+        1 << ((position_index - distance) % NUMBER_OF_TRIANGLES)
+        | 1 << ((position_index + distance) % NUMBER_OF_TRIANGLES)
+        for distance in range(MAX_RING_DISTANCE + 1)
+    )
+    for position_index in range(NUMBER_OF_TRIANGLES)
+)
+
+# the rings around each triangle, from the nearest to the farthest
+NEAREST_RINGS: tuple[tuple[int, ...], ...] = tuple(
+    RING_MASKS[position_index][1:] for position_index in range(NUMBER_OF_TRIANGLES)
+)
+
+# MASK_INDICES[mask] lists the triangle indices set in a 12-bit mask
+MASK_INDICES: tuple[tuple[int, ...], ...] = tuple(
+    tuple(i for i in range(NUMBER_OF_TRIANGLES) if (mask >> i) & 1) for mask in range(1 << NUMBER_OF_TRIANGLES)
+)
+
+
+def find_nearest(position_index: int, allowed_mask: int) -> int:
+    # mask of the allowed triangles nearest to position_index, 0 when there is none
+    for ring in NEAREST_RINGS[position_index]:
+        nearest = ring & allowed_mask
+        if nearest:
+            return nearest
+    return 0
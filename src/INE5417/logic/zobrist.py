@@ -0,0 +1,22 @@
+import random
+
+from ..utils.constants import NUMBER_OF_TRIANGLES
+
+ZOBRIST_SEED: int = 5417
+
+_generator = random.Random(ZOBRIST_SEED)
+
+# indexed by (triangle_index << 4) | (color_index << 3) | stone_value
+STONE_KEYS: list[int] = [_generator.getrandbits(64) for _ in range(NUMBER_OF_TRIANGLES << 4)]
+TURN_KEY: int = _generator.getrandbits(64)
+# indexed by the packed moves of move.py, NO_MOVE included
+LAST_MOVE_KEYS: list[int] = [_generator.getrandbits(64) for _ in range(256)]
+PREVIOUS_MOVE_KEYS: list[int] = [_generator.getrandbits(64) for _ in range(256)]
+
+
+def get_stone_key(triangle_index: int, color_index: int, stone_value: int) -> int:
+    return STONE_KEYS[(triangle_index << 4) | (color_index << 3) | stone_value]
+
+
+def get_moves_key(last_move: int, previous_move: int) -> int:
+    return LAST_MOVE_KEYS[last_move] ^ PREVIOUS_MOVE_KEYS[previous_move]
@@ -0,0 +1,260 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from ..dog.async_dog_actor import AsyncDogActor
+from ..dog.dog_interface import DogPlayerInterface
+from ..dog.event_loop import EventLoopThread
+from ..dog.local_dog_server import LocalDogServer, LocalDogHttpServer, connect_proxy
+from ..dog.start_status import StartStatus
+from ..engine.players import EnginePlayer, create_player
+from ..logic.board import Board
+from ..logic.move import NO_MOVE, decode_move
+from ..utils.game_state import GameState
+from ..utils.move_type import MoveType
+
+DEFAULT_MAX_PLIES: int = 300
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class LoadStatistics:
+    def __init__(self) -> None:
+        self.move_latencies: list[float] = []
+        self.moves_sent: int = 0
+        self.games_finished: int = 0
+        self.games_abandoned: int = 0
+        self.games_too_long: int = 0
+        self.games_blocked: int = 0
+        self.start_failures: int = 0
+        self.errors: list[str] = []
+
+    def record_error(self, message: str) -> None:
+        self.errors.append(message)
+
+
+class SimulatedPlayer(DogPlayerInterface):
+    # plays through a DOG session as the Tk PlayerInterface would, choosing its moves with an engine;
+    # its callbacks run on the event loop of its AsyncDogActor
+    def __init__(self, actor: AsyncDogActor, engine: EnginePlayer, statistics: LoadStatistics, max_plies: int) -> None:
+        super().__init__()
+        self.actor: AsyncDogActor = actor
+        self.engine: EnginePlayer = engine
+        self.statistics: LoadStatistics = statistics
+        self.max_plies: int = max_plies
+        self.board: Board = Board()
+        self.opponent: "SimulatedPlayer | None" = None
+        self.players_by_id: dict[str, "SimulatedPlayer"] = {}
+        self.send_times: list[float] = []
+        self.received_moves: int = 0
+        self.plies: int = 0
+        self.done: asyncio.Event = asyncio.Event()
+
+    def get_player_id(self) -> str:
+        return str(self.actor.get_proxy().get_proxy().player_id)
+
+    def set_players_by_id(self, players_by_id: dict[str, "SimulatedPlayer"]) -> None:
+        self.players_by_id = players_by_id
+
+    async def start_match(self) -> None:
+        start_status = await self.actor.start_match(2)
+        if start_status.get_code() != "2":
+            self.statistics.start_failures += 1
+            self.statistics.record_error(f"start/: {start_status.get_message()}")
+            self.done.set()
+            return
+        self.begin_match(start_status, GameState.LOCAL_PLAYER_TO_MOVE)
+        await self.play_move()
+
+    def begin_match(self, start_status: StartStatus, game_state: GameState) -> None:
+        players = start_status.get_players()
+        self.opponent = self.players_by_id.get(players[1][1])
+        self.board.start_match(players)
+        self.board.set_game_state(game_state)
+
+    def finish(self) -> None:
+        self.done.set()
+        if self.opponent is not None:
+            self.opponent.done.set()
+
+    async def play_move(self) -> None:
+        if self.plies >= self.max_plies:
+            self.statistics.games_too_long += 1
+            self.finish()
+            return
+        move = self.engine.choose_move(self.board.to_position())
+        if move == NO_MOVE:
+            # blocked without a legal move, as in the tournament the match ends there
+            self.statistics.games_blocked += 1
+            self.finish()
+            return
+        move_type, triangle_index, stone_value = decode_move(move)
+        if move_type == MoveType.INSERT:
+            self.board.stone_selected(stone_value, True)
+        self.board.position_selected(triangle_index)
+        self.board.perform_game_over_verification()
+        self.plies += 1
+        self.send_times.append(time.perf_counter())
+        if not await self.actor.send_move(self.board.get_move_to_send()):
+            self.statistics.record_error(f"jogada {self.plies} não entregue")
+            self.finish()
+            return
+        self.statistics.moves_sent += 1
+        if self.board.get_game_state() == GameState.GAME_OVER:
+            self.statistics.games_finished += 1
+            self.finish()
+
+    def receive_start(self, start_status: StartStatus) -> None:
+        self.begin_match(start_status, GameState.REMOTE_PLAYER_TO_MOVE)
+
+    def receive_move(self, a_move: int) -> None:
+        if self.opponent is not None and self.received_moves < len(self.opponent.send_times):
+            self.statistics.move_latencies.append(
+                time.perf_counter() - self.opponent.send_times[self.received_moves]
+            )
+        self.received_moves += 1
+        self.plies += 1
+        self.board.receive_move(a_move)
+        if self.board.get_game_state() == GameState.LOCAL_PLAYER_TO_MOVE:
+            asyncio.get_running_loop().create_task(self.play_move())
+
+    def receive_withdrawal_notification(self) -> None:
+        self.statistics.games_abandoned += 1
+        self.finish()
+
+
+async def run_load(
+    matches: int, specification: str, url: str, server: LocalDogServer | None, max_plies: int, duration: float
+) -> tuple[LoadStatistics, list[SimulatedPlayer], float]:
+    statistics = LoadStatistics()
+    players = []
+    for i in range(2 * matches):
+        actor = AsyncDogActor(url=url)
+        if server is not None:
+            connect_proxy(server, actor.get_proxy().get_proxy())
+        players.append(SimulatedPlayer(actor, create_player(specification, i), statistics, max_plies))
+
+    # the players that wait for a match register first, so that every start/ pairs a host with one of them
+    for group in (players[:matches], players[matches:]):
+        messages = await asyncio.gather(*(player.actor.initialize("", player) for player in group))
+        for player, message in zip(group, messages):
+            if player.actor.get_proxy().get_status() != 2:
+                statistics.record_error(f"player/: {message}")
+    players_by_id = {player.get_player_id(): player for player in players}
+    for player in players:
+        player.set_players_by_id(players_by_id)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(player.start_match() for player in players[matches:]))
+    try:
+        await asyncio.wait_for(asyncio.gather(*(player.done.wait() for player in players)), duration)
+    except asyncio.TimeoutError:
+        statistics.record_error(f"{sum(not player.done.is_set() for player in players)} jogadores sem terminar")
+    elapsed = time.perf_counter() - start
+    await asyncio.gather(*(player.actor.close() for player in players))
+    return statistics, players, elapsed
+
+
+def summarize(statistics: LoadStatistics, players: list[SimulatedPlayer], elapsed: float) -> dict:
+    requests = {}
+    for player in players:
+        request_statistics = player.actor.get_proxy().get_request_statistics()
+        for endpoint in request_statistics.get_endpoints():
+            endpoint_statistics = request_statistics.get_endpoint_statistics(endpoint)
+            totals = requests.setdefault(endpoint, {"requests": 0, "failures": 0, "retries": 0})
+            totals["requests"] += endpoint_statistics.requests
+            totals["failures"] += endpoint_statistics.failures
+            totals["retries"] += endpoint_statistics.retries
+    total_requests = sum(totals["requests"] for totals in requests.values())
+    total_failures = sum(totals["failures"] for totals in requests.values())
+    latencies = statistics.move_latencies
+    return {
+        "players": len(players),
+        "seconds": elapsed,
+        "moves_delivered": len(latencies),
+        "moves_per_second": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "requests_per_second": total_requests / elapsed if elapsed > 0 else 0.0,
+        "latency_p50": percentile(latencies, 0.50),
+        "latency_p99": percentile(latencies, 0.99),
+        "latency_max": max(latencies, default=0.0),
+        "games_finished": statistics.games_finished,
+        "games_abandoned": statistics.games_abandoned,
+        "games_too_long": statistics.games_too_long,
+        "games_blocked": statistics.games_blocked,
+        "start_failures": statistics.start_failures,
+        "error_rate": total_failures / total_requests if total_requests else 0.0,
+        "errors": statistics.errors,
+        "requests": requests,
+    }
+
+
+def main(arguments: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Carga de muitos clientes DOG simulados jogando partidas")
+    parser.add_argument("--matches", type=int, default=100, help="partidas simultâneas (o dobro de jogadores)")
+    parser.add_argument("--player", default="random", help='"random", "alpha_beta:<segundos>" ou "mcts:<segundos>"')
+    parser.add_argument("--url", help="servidor DOG a usar (padrão: um servidor local iniciado pela ferramenta)")
+    parser.add_argument("--in-process", action="store_true", help="fala com o servidor local sem sockets")
+    parser.add_argument("--max-plies", type=int, default=DEFAULT_MAX_PLIES)
+    parser.add_argument("--duration", type=float, default=300.0, help="tempo máximo, em segundos")
+    parser.add_argument("--workers", type=int, default=64, help="requisições HTTP simultâneas")
+    parser.add_argument("--output", help="arquivo JSON com o resumo")
+    options = parser.parse_args(arguments)
+
+    server_thread = None
+    in_process_server = None
+    url = options.url
+    if url is None and options.in_process:
+        in_process_server = LocalDogServer()
+        url = "http://dog.local/"
+    elif url is None:
+        server_thread = EventLoopThread(max_workers=1)
+        server_thread.start()
+        url = server_thread.run_coroutine(LocalDogHttpServer(LocalDogServer()).start())
+    client_thread = EventLoopThread(max_workers=options.workers)
+    client_thread.start()
+    try:
+        statistics, players, elapsed = client_thread.run_coroutine(
+            run_load(options.matches, options.player, url, in_process_server, options.max_plies, options.duration)
+        )
+    finally:
+        client_thread.stop(timeout=5.0)
+        if server_thread is not None:
+            server_thread.stop(timeout=5.0)
+    summary = summarize(statistics, players, elapsed)
+
+    print(f"{summary['players']} jogadores em {url}, {summary['seconds']:.2f} s")
+    print(
+        f"  {summary['moves_delivered']} jogadas entregues ({summary['moves_per_second']:.1f} jogadas/s, "
+        f"{summary['requests_per_second']:.1f} requisições/s)"
+    )
+    print(
+        f"  latência de entrega: p50 {summary['latency_p50'] * 1000:.0f} ms, "
+        f"p99 {summary['latency_p99'] * 1000:.0f} ms, máxima {summary['latency_max'] * 1000:.0f} ms"
+    )
+    print(
+        f"  partidas: {summary['games_finished']} encerradas, {summary['games_abandoned']} abandonadas, "
+        f"{summary['games_blocked']} por bloqueio, {summary['games_too_long']} longas demais, {summary['start_failures']} não iniciadas"
+    )
+    print(f"  taxa de erro: {summary['error_rate']:.2%}")
+    for endpoint, totals in summary["requests"].items():
+        print(
+            f"  {endpoint:<10} {totals['requests']:>8} requisições {totals['failures']:>6} falhas "
+            f"{totals['retries']:>6} repetições"
+        )
+    for error in summary["errors"][:10]:
+        print(f"  erro: {error}")
+    if options.output:
+        with open(options.output, "w") as output_file:
+            json.dump(summary, output_file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
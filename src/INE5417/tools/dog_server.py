@@ -0,0 +1,50 @@
+import argparse
+import asyncio
+import sys
+
+from ..dog.local_dog_server import LocalDogServer, LocalDogHttpServer, ONLINE_TIMEOUT
+
+STATISTICS_INTERVAL: float = 10.0  # seconds
+
+
+async def report_statistics(server: LocalDogServer, http_server: LocalDogHttpServer, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        print(
+            f"{server.get_number_of_players()} jogadores, {http_server.get_open_connections()} conexões, "
+            f"{server.get_matches_started()} partidas, {server.get_moves_received()} jogadas"
+        )
+        print(server.get_statistics())
+
+
+async def serve(host: str, port: int, online_timeout: float, statistics_interval: float) -> None:
+    server = LocalDogServer(online_timeout)
+    http_server = LocalDogHttpServer(server, host, port)
+    url = await http_server.start()
+    print(f"Servidor DOG local em {url} (python3 main.py --dog-server {url})")
+    if statistics_interval > 0:
+        asyncio.get_running_loop().create_task(report_statistics(server, http_server, statistics_interval))
+    await http_server.serve_forever()
+
+
+def main(arguments: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Servidor DOG local, com as partidas em memória")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--online-timeout", type=float, default=ONLINE_TIMEOUT,
+        help="segundos sem contato após os quais um jogador não é mais pareado",
+    )
+    parser.add_argument(
+        "--statistics", type=float, default=STATISTICS_INTERVAL, help="segundos entre relatórios (0 desativa)"
+    )
+    options = parser.parse_args(arguments)
+    try:
+        asyncio.run(serve(options.host, options.port, options.online_timeout, options.statistics))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+import argparse
+import json
+import sys
+import time
+from array import array
+
+from ..logic.game_record import (
+    GameRecord,
+    GameRecordWriter,
+    InvalidGameRecord,
+    read_games,
+    replay_on_board,
+    validate_game,
+)
+from ..logic.move_message import MATCH_STATUSES, NEXT
+
+
+def validate(path: str, use_board: bool, max_errors: int) -> int:
+    games = 0
+    plies = 0
+    errors = 0
+    finished_games = 0
+    start = time.perf_counter()
+    for record in read_games(path):
+        try:
+            if use_board:
+                replay_on_board(record)
+                plies += record.get_number_of_moves()
+            else:
+                plies += validate_game(record)
+        except InvalidGameRecord as error:
+            errors += 1
+            if errors <= max_errors:
+                print(f"partida {games}: {error}")
+        if record.get_match_status() != NEXT:
+            finished_games += 1
+        games += 1
+    elapsed = time.perf_counter() - start
+    plies_per_second = plies / elapsed if elapsed > 0 else 0.0
+    print(
+        f"{games} partidas ({finished_games} encerradas), {plies} jogadas em {elapsed:.2f} s "
+        f"({plies_per_second:,.0f} jogadas/s), {errors} inválidas"
+    )
+    return 1 if errors else 0
+
+
+def export_games(path: str, output_path: str) -> int:
+    # one JSON object per line, for other tools and for editing records by hand
+    games = 0
+    with open(output_path, "w") as output_file:
+        for record in read_games(path):
+            line = {
+                "players": record.get_players(),
+                "local_player_first": record.is_local_player_first(),
+                "match_status": MATCH_STATUSES[record.get_match_status()],
+                "moves": record.get_moves().tolist(),
+            }
+            output_file.write(json.dumps(line) + "\n")
+            games += 1
+    print(f"{games} partidas exportadas para {output_path}")
+    return 0
+
+
+def import_games(input_path: str, path: str) -> int:
+    games = 0
+    with open(input_path) as input_file, GameRecordWriter(path) as writer:
+        for line_number, line in enumerate(input_file, 1):
+            if not line.strip():
+                continue
+            fields = json.loads(line)
+            try:
+                moves = array("H", fields["moves"])
+            except (OverflowError, TypeError) as error:
+                raise InvalidGameRecord(f"linha {line_number}: jogadas inválidas") from error
+            record = GameRecord(fields["players"], fields["local_player_first"], moves)
+            writer.write_game(record)
+            games += 1
+    print(f"{games} partidas acrescentadas a {path}")
+    return 0
+
+
+def main(arguments: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Arquivos de partidas do Qyshinsu")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    validate_parser = subparsers.add_parser("validate", help="refaz as partidas, conferindo cada jogada")
+    validate_parser.add_argument("path")
+    validate_parser.add_argument(
+        "--board", action="store_true", help="refaz as partidas no Board, como a interface (mais lento)"
+    )
+    validate_parser.add_argument("--max-errors", type=int, default=10, help="erros mostrados")
+    export_parser = subparsers.add_parser("export", help="exporta as partidas em JSON, uma por linha")
+    export_parser.add_argument("path")
+    export_parser.add_argument("output")
+    import_parser = subparsers.add_parser("import", help="acrescenta partidas em JSON, uma por linha")
+    import_parser.add_argument("input")
+    import_parser.add_argument("path")
+    options = parser.parse_args(arguments)
+
+    try:
+        match options.command:
+            case "validate":
+                return validate(options.path, options.board, options.max_errors)
+            case "export":
+                return export_games(options.path, options.output)
+            case "import":
+                return import_games(options.input, options.path)
+    except InvalidGameRecord as error:
+        print(error)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
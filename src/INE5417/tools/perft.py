@@ -0,0 +1,248 @@
+import argparse
+import copy
+import sys
+import time
+
+from ..logic.board import Board
+from ..logic.move import encode_move, decode_move
+from ..logic.move_generator import MAX_MOVES, generate_moves
+from ..logic.position import Position
+from ..utils.game_state import GameState
+from ..utils.move_type import MoveType
+
+FIRST_PLAYER = ["first", "1", "1"]
+SECOND_PLAYER = ["second", "2", "2"]
+
+# mid-game positions given by the moves played from the start of a match
+RECORDED_POSITIONS: dict[str, list[tuple[MoveType, int, int]]] = {
+    "start": [],
+    "opening": [
+        (MoveType.INSERT, 0, 3),
+        (MoveType.INSERT, 3, 2),
+        (MoveType.INSERT, 1, 4),
+        (MoveType.INSERT, 9, 5),
+    ],
+    "zero_insertion": [
+        (MoveType.INSERT, 4, 1),
+        (MoveType.INSERT, 5, 0),
+    ],
+    "zero_removal": [
+        (MoveType.INSERT, 2, 2),
+        (MoveType.INSERT, 0, 0),
+        (MoveType.INSERT, 1, 1),
+        (MoveType.REMOVE, 0, 0),
+    ],
+    "crowded": [
+        (MoveType.INSERT, 6, 5),
+        (MoveType.INSERT, 11, 1),
+        (MoveType.INSERT, 10, 1),
+        (MoveType.INSERT, 9, 3),
+        (MoveType.INSERT, 0, 2),
+        (MoveType.INSERT, 2, 4),
+        (MoveType.REMOVE, 10, 1),
+    ],
+    "reinsertion_ban": [
+        (MoveType.INSERT, 5, 2),
+        (MoveType.INSERT, 7, 5),
+        (MoveType.INSERT, 0, 5),
+        (MoveType.REMOVE, 7, 5),
+        (MoveType.INSERT, 2, 5),
+    ],
+    "endgame": [
+        (MoveType.INSERT, 4, 1),
+        (MoveType.INSERT, 5, 2),
+        (MoveType.INSERT, 7, 4),
+        (MoveType.INSERT, 11, 4),
+        (MoveType.INSERT, 3, 0),
+        (MoveType.INSERT, 2, 1),
+        (MoveType.INSERT, 1, 0),
+        (MoveType.INSERT, 0, 3),
+        (MoveType.INSERT, 9, 3),
+        (MoveType.REMOVE, 0, 3),
+    ],
+}
+
+
+def perft(position: Position, depth: int) -> int:
+    moves = [0] * MAX_MOVES
+    count = generate_moves(position, moves)
+    if depth == 1:
+        return count
+    nodes = 0
+    for i in range(count):
+        move = moves[i]
+        undo = position.make_move(move)
+        nodes += perft(position, depth - 1)
+        position.unmake_move(move, undo)
+    return nodes
+
+
+def create_reference_boards() -> list[Board]:
+    first_board = Board()
+    first_board.start_match([FIRST_PLAYER, SECOND_PLAYER])
+    first_board.set_game_state(GameState.LOCAL_PLAYER_TO_MOVE)
+    second_board = Board()
+    second_board.start_match([SECOND_PLAYER, FIRST_PLAYER])
+    second_board.set_game_state(GameState.REMOTE_PLAYER_TO_MOVE)
+    return [first_board, second_board]
+
+
+def get_moving_board_index(boards: list[Board]) -> int | None:
+    for i in range(len(boards)):
+        if boards[i].get_game_state() == GameState.LOCAL_PLAYER_TO_MOVE:
+            return i
+    return None
+
+
+def generate_reference_moves(boards: list[Board]) -> list[int]:
+    moving_board_index = get_moving_board_index(boards)
+    if moving_board_index is None:
+        return []
+    moving_board = boards[moving_board_index]
+    moves = set()
+    for selected_position_index in range(12):
+        # a removal needs no selected stone, an insertion is tried with every stone in hand
+        selections = [None]
+        for stone_value in range(6):
+            if moving_board.local_player.has_stone_with_value(stone_value):
+                selections.append(stone_value)
+        for stone_value in selections:
+            board = copy.deepcopy(moving_board)
+            if stone_value is not None:
+                board.stone_selected(stone_value, True)
+            board.position_selected(selected_position_index)
+            if board.get_is_legal_move():
+                moves.add(board.get_last_local_player_move())
+    return sorted(moves)
+
+
+def apply_reference_move(boards: list[Board], move: int) -> list[Board]:
+    boards = copy.deepcopy(boards)
+    moving_board_index = get_moving_board_index(boards)
+    moving_board = boards[moving_board_index]
+    waiting_board = boards[1 - moving_board_index]
+    move_type, triangle_index, stone_value = decode_move(move)
+    if move_type == MoveType.INSERT:
+        moving_board.stone_selected(stone_value, True)
+    moving_board.position_selected(triangle_index)
+    if not moving_board.get_is_legal_move():
+        raise ValueError(f"Jogada ilegal para o tabuleiro de referência: {decode_move(move)}")
+    moving_board.perform_game_over_verification()
+    waiting_board.receive_move(moving_board.get_move_to_send())
+    return boards
+
+
+def reference_perft(boards: list[Board], depth: int) -> int:
+    moves = generate_reference_moves(boards)
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        nodes += reference_perft(apply_reference_move(boards, move), depth - 1)
+    return nodes
+
+
+def board_perft(board: Board, position: Position, depth: int) -> int:
+    # walks Board.make_move/unmake_move in lockstep with Position, checking both stay equal
+    moves = [0] * MAX_MOVES
+    count = generate_moves(position, moves)
+    if depth == 1:
+        return count
+    nodes = 0
+    for i in range(count):
+        move = moves[i]
+        undo = position.make_move(move)
+        board.make_move(move)
+        if board.to_position() != position:
+            raise ValueError(f"Board.make_move divergente após {decode_move(move)}")
+        nodes += board_perft(board, position, depth - 1)
+        board.unmake_move()
+        position.unmake_move(move, undo)
+        if board.to_position() != position:
+            raise ValueError(f"Board.unmake_move divergente após {decode_move(move)}")
+    return nodes
+
+
+def divide(position: Position, boards: list[Board], depth: int) -> list[str]:
+    # per root move node counts of both engines, used to locate the first disagreement
+    report = []
+    moves = [0] * MAX_MOVES
+    count = generate_moves(position, moves)
+    fast_moves = set(moves[:count])
+    reference_moves = set(generate_reference_moves(boards))
+    for move in sorted(fast_moves | reference_moves):
+        if move not in reference_moves:
+            report.append(f"{decode_move(move)}: gerada apenas pelo motor rápido")
+        elif move not in fast_moves:
+            report.append(f"{decode_move(move)}: gerada apenas pelo tabuleiro de referência")
+        elif depth > 1:
+            undo = position.make_move(move)
+            fast_nodes = perft(position, depth - 1)
+            position.unmake_move(move, undo)
+            reference_nodes = reference_perft(apply_reference_move(boards, move), depth - 1)
+            if fast_nodes != reference_nodes:
+                report.append(f"{decode_move(move)}: {fast_nodes} != {reference_nodes}")
+    return report
+
+
+def build_recorded_position(moves: list[tuple[MoveType, int, int]]) -> tuple[Position, list[Board]]:
+    position = Position()
+    boards = create_reference_boards()
+    for move_type, triangle_index, stone_value in moves:
+        move = encode_move(move_type, triangle_index, stone_value)
+        position.make_move(move)
+        boards = apply_reference_move(boards, move)
+    moving_board_index = get_moving_board_index(boards)
+    if moving_board_index is not None and boards[moving_board_index].to_position() != position:
+        raise ValueError("Conversão entre Board e Position divergente")
+    return position, boards
+
+
+def measure(function, *arguments) -> tuple[int, float]:
+    start = time.perf_counter()
+    nodes = function(*arguments)
+    return nodes, time.perf_counter() - start
+
+
+def format_result(nodes: int, elapsed: float) -> str:
+    nodes_per_second = nodes / elapsed if elapsed > 0 else 0.0
+    return f"{nodes:>10} nós {elapsed:8.3f} s {nodes_per_second:>12,.0f} nós/s"
+
+
+def main(arguments: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Perft do motor de regras do Qyshinsu")
+    parser.add_argument("--depth", type=int, default=4, help="profundidade do perft do motor rápido")
+    parser.add_argument(
+        "--reference-depth", type=int, default=2,
+        help="profundidade da verificação contra o Board (0 desativa a verificação)",
+    )
+    parser.add_argument("--position", choices=sorted(RECORDED_POSITIONS), action="append")
+    options = parser.parse_args(arguments)
+
+    names = options.position or list(RECORDED_POSITIONS)
+    mismatches = 0
+    for name in names:
+        position, boards = build_recorded_position(RECORDED_POSITIONS[name])
+        for depth in range(1, options.depth + 1):
+            print(f"{name:<16} profundidade {depth}  position: {format_result(*measure(perft, position, depth))}")
+        for depth in range(1, options.reference_depth + 1):
+            fast_nodes = perft(position, depth)
+            reference_nodes, elapsed = measure(reference_perft, boards, depth)
+            status = "ok" if fast_nodes == reference_nodes else "DIVERGENTE"
+            print(f"{name:<16} profundidade {depth}  board:    {format_result(reference_nodes, elapsed)}  {status}")
+            if fast_nodes != reference_nodes:
+                mismatches += 1
+                for line in divide(position, boards, depth):
+                    print("    " + line)
+                break
+        moving_board_index = get_moving_board_index(boards)
+        if options.reference_depth > 0 and moving_board_index is not None:
+            board = boards[moving_board_index]
+            depth = options.reference_depth + 1
+            board_nodes, elapsed = measure(board_perft, board, position, depth)
+            print(f"{name:<16} profundidade {depth}  make_move: {format_result(board_nodes, elapsed)}  ok")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
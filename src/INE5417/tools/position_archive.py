@@ -0,0 +1,107 @@
+import argparse
+import sys
+import time
+
+from ..logic.game_record import InvalidGameRecord, read_games
+from ..logic.position_archive import (
+    InvalidPositionArchive,
+    PositionArchive,
+    build_archive,
+    combine_patterns,
+    empty_triangle_pattern,
+    stone_pattern,
+)
+from ..utils.constants import COLORS, NUMBER_OF_STONE_VALUES, NUMBER_OF_TRIANGLES
+
+DEFAULT_SHOWN: int = 10
+
+
+def parse_stone(text: str) -> tuple[int, int]:
+    # "5:black:3" (triangle 5 holds a black 3) or "5:empty"
+    fields = text.split(":")
+    try:
+        triangle_index = int(fields[0])
+        if fields[1] == "empty" and len(fields) == 2:
+            stone_value = 0
+        elif len(fields) == 3:
+            color_index = COLORS.index(fields[1])
+            stone_value = int(fields[2])
+        else:
+            raise ValueError(text)
+    except (IndexError, ValueError):
+        raise argparse.ArgumentTypeError(f'"{text}" não é <triângulo>:<cor>:<valor> nem <triângulo>:empty')
+    if not 0 <= triangle_index < NUMBER_OF_TRIANGLES:
+        raise argparse.ArgumentTypeError(f"triângulo {triangle_index} fora de 0 a {NUMBER_OF_TRIANGLES - 1}")
+    if not 0 <= stone_value < NUMBER_OF_STONE_VALUES:
+        raise argparse.ArgumentTypeError(f"valor {stone_value} fora de 0 a {NUMBER_OF_STONE_VALUES - 1}")
+    if len(fields) == 2:
+        return empty_triangle_pattern(triangle_index)
+    return stone_pattern(triangle_index, color_index, stone_value)
+
+
+def build(records_path: str, archive_path: str) -> int:
+    start = time.perf_counter()
+    writer = build_archive(read_games(records_path), archive_path)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{writer.get_number_of_positions()} posições de {writer.get_number_of_games()} partidas em {elapsed:.2f} s "
+        f"({writer.get_number_of_invalid_games()} partidas inválidas, incluídas até a primeira jogada inválida)"
+    )
+    return 0
+
+
+def show_records(archive: PositionArchive, records: list[int], shown: int) -> None:
+    for record in records[:shown]:
+        print(f"  partida {archive.get_game(record)}, jogada {archive.get_ply(record)}: {archive.get_position(record)}")
+
+
+def query(archive_path: str, zobrist_key: int | None, patterns: list[tuple[int, int]], shown: int) -> int:
+    start = time.perf_counter()
+    with PositionArchive(archive_path) as archive:
+        opened = time.perf_counter()
+        print(f"{len(archive)} posições, aberto em {(opened - start) * 1000:.2f} ms")
+        if zobrist_key is not None:
+            records = archive.find_zobrist_key(zobrist_key)
+            elapsed = time.perf_counter() - opened
+            games = archive.find_games(zobrist_key)
+            print(f"chave {zobrist_key:#018x}: {len(records)} posições em {len(games)} partidas, {elapsed * 1000:.2f} ms")
+            show_records(archive, records, shown)
+        if patterns:
+            query_start = time.perf_counter()
+            records = archive.find_matching(*combine_patterns(patterns))
+            elapsed = time.perf_counter() - query_start
+            print(f"{len(records)} posições com as pedras pedidas, {elapsed * 1000:.2f} ms")
+            show_records(archive, records, shown)
+    return 0
+
+
+def main(arguments: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Arquivo de posições do Qyshinsu, indexado pela chave Zobrist")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="gera o arquivo de posições de um arquivo de partidas")
+    build_parser.add_argument("records")
+    build_parser.add_argument("archive")
+    query_parser = subparsers.add_parser("query", help="procura posições no arquivo")
+    query_parser.add_argument("archive")
+    query_parser.add_argument("--zobrist", type=lambda text: int(text, 0), help="chave Zobrist (ex.: 0x1f3a...)")
+    query_parser.add_argument(
+        "--stone", type=parse_stone, action="append", default=[],
+        help='"<triângulo>:<cor>:<valor>" ou "<triângulo>:empty"; repetida, todas devem valer',
+    )
+    query_parser.add_argument("--show", type=int, default=DEFAULT_SHOWN, help="posições mostradas")
+    options = parser.parse_args(arguments)
+
+    try:
+        match options.command:
+            case "build":
+                return build(options.records, options.archive)
+            case "query":
+                return query(options.archive, options.zobrist, options.stone, options.show)
+    except (InvalidGameRecord, InvalidPositionArchive) as error:
+        print(error)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+import argparse
+import sys
+
+from .perft import RECORDED_POSITIONS
+from ..engine.alpha_beta import AlphaBetaSearch
+from ..engine.mcts import MonteCarloTreeSearch
+from ..logic.move import encode_move, decode_move
+from ..logic.position import Position
+
+
+def build_position(name: str) -> Position:
+    position = Position()
+    for move_type, triangle_index, stone_value in RECORDED_POSITIONS[name]:
+        position.make_move(encode_move(move_type, triangle_index, stone_value))
+    return position
+
+
+def run_alpha_beta(time_budget: float, names: list[str]) -> None:
+    search = AlphaBetaSearch(time_budget)
+    for name in names:
+        result = search.search(build_position(name))
+        print(
+            f"{time_budget:6.2f} s  {name:<16} profundidade {result.get_depth():>2}  "
+            f"{result.get_nodes():>9} nós {result.get_elapsed():7.3f} s "
+            f"{result.get_nodes_per_second():>10,.0f} nós/s  "
+            f"avaliação {result.get_score():>6}  jogada {decode_move(result.get_best_move())}"
+        )
+    print(f"{time_budget:6.2f} s  {search.get_transposition_table()}")
+
+
+def run_mcts(time_budget: float, names: list[str], workers: int | None) -> None:
+    with MonteCarloTreeSearch(time_budget, workers) as search:
+        for name in names:
+            result = search.search(build_position(name))
+            print(
+                f"{time_budget:6.2f} s  {name:<16} {result.get_workers():>2} processos  "
+                f"{result.get_playouts():>9} simulações {result.get_elapsed():7.3f} s "
+                f"{result.get_playouts_per_second():>10,.0f} simulações/s  "
+                f"vitórias {result.get_win_rate():6.1%}  jogada {decode_move(result.get_best_move())}"
+            )
+
+
+def main(arguments: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Profundidade e velocidade das buscas do computador")
+    parser.add_argument("--engine", choices=["alpha_beta", "mcts"], default="alpha_beta")
+    parser.add_argument(
+        "--time", type=float, nargs="+", default=[0.05, 0.5, 5.0], help="tempos por jogada, em segundos"
+    )
+    parser.add_argument("--workers", type=int, help="processos usados pelo MCTS (padrão: número de núcleos)")
+    parser.add_argument("--position", choices=sorted(RECORDED_POSITIONS), action="append")
+    options = parser.parse_args(arguments)
+
+    names = options.position or list(RECORDED_POSITIONS)
+    for time_budget in options.time:
+        if options.engine == "mcts":
+            run_mcts(time_budget, names, options.workers)
+        else:
+            run_alpha_beta(time_budget, names)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
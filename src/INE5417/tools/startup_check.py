@@ -0,0 +1,75 @@
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from ..utils.startup_timer import STARTUP_BUDGET
+
+# modules main.py must not import before the DOG connection is made
+LAZY_MODULES: tuple[str, ...] = ("requests", "urllib3")
+
+# run in a fresh interpreter, so every import is cold; the menu images are decoded and resized without the
+# disk cache, as on the first run, and the window itself is left out, as it needs a display
+CHILD_CODE: str = """
+import json, sys, time
+from pathlib import Path
+from INE5417.utils.startup_timer import StartupTimer
+startup_timer = StartupTimer()
+import INE5417.display.player_interface
+startup_timer.mark("importações")
+from INE5417.display.asset_cache import MENU_ASSET_NAMES, ResizedImageCache, get_asset_specifications
+resized_images = ResizedImageCache(cache_dir=None if sys.argv[1] == "" else Path(sys.argv[1]))
+for name, file_name, size in get_asset_specifications():
+    if name in MENU_ASSET_NAMES:
+        resized_images.load_image("default", file_name, size)
+startup_timer.mark("imagens do menu")
+phases = [(name, end - start) for name, start, end in startup_timer.get_phases()]
+print(json.dumps({"phases": phases, "loaded": sorted(sys.modules)}))
+"""
+
+
+def run_child(cache_dir: str) -> tuple[dict, float]:
+    source_dir = Path(__file__).parent.parent.parent
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", CHILD_CODE, cache_dir], cwd=source_dir, capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout), time.perf_counter() - start
+
+
+def main(arguments: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Confere o tempo de inicialização a frio e as importações feitas antes da conexão com o DOG"
+    )
+    parser.add_argument(
+        "--budget", type=float, default=STARTUP_BUDGET, help="segundos até o menu poder ser exibido, com o interpretador"
+    )
+    parser.add_argument("--runs", type=int, default=3, help="execuções; vale a mais rápida")
+    parser.add_argument("--warm-cache", action="store_true", help="usa o cache de imagens em disco, como a partir da segunda execução")
+    options = parser.parse_args(arguments)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        results = []
+        for _ in range(max(1, options.runs)):
+            results.append(run_child(cache_dir if options.warm_cache else ""))
+    report, elapsed = min(results, key=lambda result: result[1])
+
+    failures = 0
+    print(f"inicialização a frio: {elapsed * 1000:.1f} ms (limite {options.budget * 1000:.0f} ms)")
+    for name, duration in report["phases"]:
+        print(f"  {name:<22} {duration * 1000:8.1f} ms")
+    if elapsed > options.budget:
+        print("  ACIMA DO LIMITE")
+        failures += 1
+    for module in LAZY_MODULES:
+        if module in report["loaded"]:
+            print(f"  {module} importado antes da conexão com o DOG")
+            failures += 1
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+import argparse
+import json
+import os
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from ..engine.players import create_player
+from ..logic.board import Board
+from ..logic.game_record import GameRecord, GameRecordWriter
+from ..logic.move import NO_MOVE, decode_move
+from ..utils.game_state import GameState
+from ..utils.move_type import MoveType
+
+DEFAULT_MAX_PLIES: int = 300
+
+
+def play_game(
+    specifications: tuple[str, str], seed: int, max_plies: int, moves: list[int] | None = None
+) -> tuple[int | None, int]:
+    # plays one match between two engines, each one looking at its own Board exactly as a networked
+    # client does; returns the index of the winner (None for a draw by length) and the number of plies,
+    # appending the move messages sent to moves when given
+    players = [create_player(specifications[0], seed), create_player(specifications[1], seed + 1)]
+    first_player = [specifications[0], "1", "1"]
+    second_player = [specifications[1], "2", "2"]
+    boards = [Board(), Board()]
+    boards[0].start_match([first_player, second_player])
+    boards[0].set_game_state(GameState.LOCAL_PLAYER_TO_MOVE)
+    boards[1].start_match([second_player, first_player])
+    boards[1].set_game_state(GameState.REMOTE_PLAYER_TO_MOVE)
+
+    plies = 0
+    moving_player = 0
+    while plies < max_plies:
+        board = boards[moving_player]
+        move = players[moving_player].choose_move(board.to_position())
+        if move == NO_MOVE:
+            # blocked without a legal move
+            return 1 - moving_player, plies
+        move_type, triangle_index, stone_value = decode_move(move)
+        if move_type == MoveType.INSERT:
+            board.stone_selected(stone_value, True)
+        board.position_selected(triangle_index)
+        if not board.get_is_legal_move():
+            raise ValueError(f"{specifications[moving_player]} escolheu uma jogada ilegal: {decode_move(move)}")
+        board.perform_game_over_verification()
+        boards[1 - moving_player].receive_move(board.get_move_to_send())
+        if moves is not None:
+            moves.append(board.get_move_to_send())
+        plies += 1
+        if board.get_game_state() == GameState.GAME_OVER:
+            return moving_player, plies
+        moving_player = 1 - moving_player
+    return None, plies
+
+
+def play_game_task(task: tuple[int, int, str, str, int, int, bool]) -> dict:
+    # first_seat: which of the two players given on the command line moves first
+    game_index, first_seat, first_specification, second_specification, seed, max_plies, record = task
+    moves = [] if record else None
+    start = time.perf_counter()
+    winner, plies = play_game((first_specification, second_specification), seed, max_plies, moves)
+    result = {
+        "game": game_index,
+        "first": first_specification,
+        "second": second_specification,
+        "winner": None if winner is None else (first_specification, second_specification)[winner],
+        "winner_moved_first": winner == 0,
+        "first_seat": first_seat,
+        "winner_seat": None if winner is None else (first_seat, 1 - first_seat)[winner],
+        "plies": plies,
+        "seconds": time.perf_counter() - start,
+    }
+    if record:
+        result["moves"] = moves
+    return result
+
+
+def write_game_records(path: str, results: list[dict]) -> None:
+    # the games as seen by the player who moved first
+    with GameRecordWriter(path) as writer:
+        for result in results:
+            players = [[result["first"], "1", "1"], [result["second"], "2", "2"]]
+            writer.write_game(GameRecord(players, True, array("H", result.pop("moves"))))
+
+
+def summarize(specifications: list[str], results: list[dict], elapsed: float) -> dict:
+    lengths = [result["plies"] for result in results]
+    summary = {
+        "games": len(results),
+        "seconds": elapsed,
+        "games_per_second": len(results) / elapsed if elapsed > 0 else 0.0,
+        "draws": sum(1 for result in results if result["winner"] is None),
+        "first_player_wins": sum(1 for result in results if result["winner_moved_first"]),
+        "mean_length": sum(lengths) / len(lengths) if lengths else 0.0,
+        "min_length": min(lengths, default=0),
+        "max_length": max(lengths, default=0),
+        "players": {},
+    }
+    # wins are counted by seat, so that a player against itself is reported as two players
+    for seat, label in enumerate(get_seat_labels(specifications)):
+        summary["players"][label] = {
+            "specification": specifications[seat],
+            "wins": sum(1 for result in results if result["winner_seat"] == seat),
+            "games": len(results),
+        }
+    return summary
+
+
+def get_seat_labels(specifications: list[str]) -> list[str]:
+    if specifications[0] == specifications[1]:
+        return [f"{specification} ({seat + 1})" for seat, specification in enumerate(specifications)]
+    return list(specifications)
+
+
+def main(arguments: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Torneio entre motores do Qyshinsu, sem interface gráfica")
+    parser.add_argument("players", nargs=2, help='"random", "alpha_beta:<segundos>" ou "mcts:<segundos>"')
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-plies", type=int, default=DEFAULT_MAX_PLIES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="arquivo JSON com o resumo e o resultado de cada partida")
+    parser.add_argument("--record", help="arquivo de partidas (ver game_record.py) ao qual as partidas são acrescentadas")
+    options = parser.parse_args(arguments)
+
+    # the players alternate who moves first
+    tasks = []
+    for i in range(options.games):
+        first, second = options.players[i % 2], options.players[1 - i % 2]
+        tasks.append((i, i % 2, first, second, options.seed + 2 * i, options.max_plies, options.record is not None))
+
+    start = time.perf_counter()
+    if options.workers == 1:
+        results = [play_game_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=options.workers) as executor:
+            results = list(executor.map(play_game_task, tasks, chunksize=max(1, len(tasks) // (4 * options.workers))))
+    summary = summarize(options.players, results, time.perf_counter() - start)
+    if options.record:
+        write_game_records(options.record, results)
+
+    print(f"{summary['games']} partidas em {summary['seconds']:.2f} s ({summary['games_per_second']:.2f} partidas/s)")
+    for specification, statistics in summary["players"].items():
+        print(f"  {specification:<20} {statistics['wins']:>6} vitórias em {statistics['games']} partidas")
+    print(f"  empates por duração: {summary['draws']}")
+    print(f"  vitórias de quem começa: {summary['first_player_wins']}")
+    print(
+        f"  duração: média {summary['mean_length']:.1f}, mínima {summary['min_length']}, "
+        f"máxima {summary['max_length']} jogadas"
+    )
+    if options.output:
+        with open(options.output, "w") as output_file:
+            json.dump({"summary": summary, "games": results}, output_file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
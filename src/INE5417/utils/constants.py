@@ -1,9 +1,12 @@
+import os
 from pathlib import Path
 
 GAME_NAME: str = "Qyshinsu"
 VERSION: str = "0.1"
 
 RESOURCES_DIR: Path = Path(__file__).parent.parent.parent / "resources"
+# resized images, so the game starts without resampling the PNGs again (see display/asset_cache.py)
+ASSET_CACHE_DIR: Path = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "qyshinsu" / "assets"
 
 FONT: str = "Arial 12 bold"
 
@@ -15,6 +18,10 @@ BOARD_HEIGHT: int = int(WINDOW_HEIGHT * 0.587)
 
 COLOR_A = "red"
 COLOR_B = "black"
+COLORS = (COLOR_A, COLOR_B)
+
+NUMBER_OF_TRIANGLES: int = 12
+NUMBER_OF_STONE_VALUES: int = 6
 
 ASSETS_INFO = (
     ("menu_image.png", (WINDOW_WIDTH, WINDOW_HEIGHT)),
@@ -0,0 +1,61 @@
+import time
+
+# seconds from the start of the imports to the main menu being shown, the name dialog excluded
+STARTUP_BUDGET: float = 1.0
+
+
+class StartupTimer:
+    # wall time of the startup phases: the ones run in sequence by the Tk thread are marked as they end,
+    # the ones running alongside them (network, background loading) are begun and ended by name
+    def __init__(self, start_time: float | None = None) -> None:
+        if start_time is None:
+            start_time = time.perf_counter()
+        self.start_time: float = start_time
+        self.last_mark: float = start_time
+        # (name, start, end), in the order the phases end
+        self.phases: list[tuple[str, float, float]] = []
+        self.open_phases: dict[str, float] = {}
+
+    def mark(self, name: str) -> None:
+        now = time.perf_counter()
+        self.phases.append((name, self.last_mark, now))
+        self.last_mark = now
+
+    def begin(self, name: str) -> None:
+        self.open_phases[name] = time.perf_counter()
+
+    def end(self, name: str) -> None:
+        start = self.open_phases.pop(name, None)
+        if start is not None:
+            self.phases.append((name, start, time.perf_counter()))
+
+    def has_open_phases(self) -> bool:
+        return bool(self.open_phases)
+
+    def get_phases(self) -> list[tuple[str, float, float]]:
+        return self.phases
+
+    def get_phase_duration(self, name: str) -> float | None:
+        for phase_name, start, end in self.phases:
+            if phase_name == name:
+                return end - start
+        return None
+
+    def get_time_until(self, name: str) -> float | None:
+        # from the start to the end of the phase
+        for phase_name, _, end in self.phases:
+            if phase_name == name:
+                return end - self.start_time
+        return None
+
+    def get_elapsed(self) -> float:
+        return max((end for _, _, end in self.phases), default=self.start_time) - self.start_time
+
+    def format_report(self) -> str:
+        lines = ["Inicialização:"]
+        for name, start, end in sorted(self.phases, key=lambda phase: phase[1]):
+            lines.append(
+                f"  {name:<22} início {(start - self.start_time) * 1000:8.1f} ms  duração {(end - start) * 1000:8.1f} ms"
+            )
+        lines.append(f"  {'total':<22} {self.get_elapsed() * 1000:8.1f} ms")
+        return "\n".join(lines)
@@ -1,4 +1,41 @@
-from INE5417.display.player_interface import PlayerInterface
+import argparse
+
+from INE5417.utils.startup_timer import StartupTimer
 
 if __name__ == "__main__":
-    PlayerInterface()
+    # the game's modules are imported once the timer runs, so the "importações" phase covers all of them
+    startup_timer = StartupTimer()
+    from INE5417.dog.dog_actor import TRANSPORTS, DEFAULT_TRANSPORT
+    from INE5417.dog.dog_proxy import DOG_SERVER_URL
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--engine", type=float, metavar="SEGUNDOS",
+        help="joga contra o computador, com o tempo dado por jogada (ex.: 0.05, 0.5, 5)",
+    )
+    parser.add_argument(
+        "--dog-server", default=DOG_SERVER_URL, metavar="URL",
+        help="endereço do servidor DOG (ex.: http://127.0.0.1:8000/ para o servidor local)",
+    )
+    parser.add_argument(
+        "--dog-transport", choices=sorted(TRANSPORTS), default=DEFAULT_TRANSPORT,
+        help="como as jogadas remotas chegam: consultas periódicas ou long polling (só no servidor local)",
+    )
+    parser.add_argument(
+        "--record", metavar="ARQUIVO",
+        help="acrescenta as partidas jogadas a um arquivo de partidas (ver tools/game_records.py)",
+    )
+    parser.add_argument(
+        "--profile-startup", action="store_true",
+        help="mostra o tempo de cada fase da inicialização (importações, imagens, Tk e rede) e, ao sair, "
+             "as estatísticas coletadas durante o jogo",
+    )
+    arguments = parser.parse_args()
+
+    # the interface, Tk and PIL are imported after the arguments are parsed
+    from INE5417.display.player_interface import PlayerInterface
+    startup_timer.mark("importações")
+    PlayerInterface(
+        arguments.engine, arguments.dog_server, arguments.dog_transport, arguments.record,
+        arguments.profile_startup, startup_timer,
+    )